@@ -29,6 +29,9 @@ const App = () => {
     const [prayedIncidents, setPrayedIncidents] = useState(new Set());
 
     const PAGE_SIZE = 12;
+    const FEED_SINCE = '2026-01-01';
+    const feedCursor = useRef(null); // (incident_date, id) of the last card loaded
+    const detailsCache = useRef(new Map()); // Full incident rows fetched by openIncident
 
     // --- Hash Utility (matching setup_admin.py) ---
     async function sha256(message) {
@@ -151,26 +154,34 @@ const App = () => {
     const fetchIncidents = useCallback(async (isNewSearch = false) => {
         setLoading(true);
         const start = isNewSearch ? 0 : page * PAGE_SIZE;
-        const end = start + PAGE_SIZE - 1;
-
-        let query = supabaseClient
-            .from('incidents')
-            .select('*', { count: 'exact' })
-            .gte('incident_date', '2026-01-01')
-            .order('incident_date', { ascending: false })
-            .range(start, end);
-
-        if (searchQuery) {
-            query = query.or(`title.ilike.%${searchQuery}%,description.ilike.%${searchQuery}%,location_raw.ilike.%${searchQuery}%`);
-        }
+        const cursor = isNewSearch ? null : feedCursor.current;
+
+        // Both RPCs return slim card rows. Searches are ranked through the full-text index;
+        // the plain feed pages by keyset. One extra row tells us whether there is another page.
+        const query = searchQuery
+            ? supabaseClient.rpc('search_incidents', {
+                p_query: searchQuery,
+                p_since: FEED_SINCE,
+                p_limit: PAGE_SIZE + 1,
+                p_offset: start
+            })
+            : supabaseClient.rpc('list_incidents', {
+                p_since: FEED_SINCE,
+                p_before_date: cursor ? cursor.incident_date : null,
+                p_before_id: cursor ? cursor.id : null,
+                p_limit: PAGE_SIZE + 1
+            });
 
-        const { data, error, count } = await query;
+        const { data, error } = await query;
 
         if (error) {
             console.error("Fetch Error:", error);
         } else {
-            setIncidents(prev => isNewSearch ? data : [...prev, ...data]);
-            setHasMore(incidents.length + data.length < (count || 0));
+            const cards = data.slice(0, PAGE_SIZE);
+            const last = cards[cards.length - 1];
+            feedCursor.current = last ? { incident_date: last.incident_date, id: last.id } : cursor;
+            setIncidents(prev => isNewSearch ? cards : [...prev, ...cards]);
+            setHasMore(data.length > PAGE_SIZE);
             setInitialSync(true);
         }
         setLoading(false);
@@ -197,6 +208,27 @@ const App = () => {
         if (node) observer.current.observe(node);
     }, [loading, hasMore]);
 
+    // --- Incident Details (summary and source links load only when a card is opened) ---
+    const openIncident = async (card) => {
+        const cached = detailsCache.current.get(card.id);
+        setSelectedIncident(cached ? { ...card, ...cached } : card);
+        logEvent('incident_view', 'FRONTEND', 'INFO', { incident_id: card.id, title: card.title });
+        if (cached) return;
+
+        const { data, error } = await supabaseClient
+            .from('incidents')
+            .select('id, summary, sources')
+            .eq('id', card.id)
+            .single();
+
+        if (error) {
+            console.error("Detail Fetch Error:", error);
+            return;
+        }
+        detailsCache.current.set(card.id, data);
+        setSelectedIncident(prev => prev && prev.id === card.id ? { ...prev, ...data } : prev);
+    };
+
     // Format Date
     const formatDate = (dateStr) => {
         const date = new Date(dateStr);
@@ -617,7 +649,7 @@ const App = () => {
                     <main className="incident-grid">
                         {incidents.map((incident, index) => {
                             const isLast = incidents.length === index + 1;
-                            const cleanDesc = stripHtml(incident.description);
+                            const cleanDesc = stripHtml(incident.excerpt || '');
 
                             return (
                                 <div key={incident.id} className="card" ref={isLast ? lastIncidentRef : null}>
@@ -629,8 +661,8 @@ const App = () => {
                                     <div className="card-header">
                                         <span className="date-badge">{formatDate(incident.incident_date)}</span>
                                         <div className="source-badges">
-                                            {incident.sources.map((s, i) => (
-                                                <span key={i} className="badge">{s.name}</span>
+                                            {(incident.source_names || []).map((name, i) => (
+                                                <span key={i} className="badge">{name}</span>
                                             ))}
                                         </div>
                                     </div>
@@ -649,10 +681,7 @@ const App = () => {
                                             <i data-lucide="heart" className={prayedIncidents.has(incident.id) ? "prayer-pulse" : ""} style={{ width: '14px', fill: prayedIncidents.has(incident.id) ? 'var(--accent-gold)' : 'none' }}></i>
                                             {incident.prayer_count || 0} Praying
                                         </div>
-                                        <button className="btn-read-more" onClick={() => {
-                                            setSelectedIncident(incident);
-                                            logEvent('incident_view', 'FRONTEND', 'INFO', { incident_id: incident.id, title: incident.title });
-                                        }}>
+                                        <button className="btn-read-more" onClick={() => openIncident(incident)}>
                                             Details & Analysis
                                         </button>
                                     </div>
@@ -770,8 +799,11 @@ const App = () => {
                             <h4 style={{ color: 'var(--accent-gold)', marginBottom: '1rem', display: 'flex', alignItems: 'center', gap: '0.5rem' }}>
                                 <i data-lucide="check-circle" style={{ width: '16px' }}></i> Verified Reporting Sources:
                             </h4>
+                            {!selectedIncident.sources && (
+                                <div className="spinner" style={{ margin: '1rem auto' }}></div>
+                            )}
                             <div style={{ display: 'flex', flexDirection: 'column', gap: '0.8rem' }}>
-                                {selectedIncident.sources.map((s, i) => (
+                                {(selectedIncident.sources || []).map((s, i) => (
                                     <a key={i} href={s.url} target="_blank" rel="noopener noreferrer" className="badge" style={{ display: 'block', padding: '1rem', textAlign: 'left', textDecoration: 'none' }}>
                                         <div style={{ display: 'flex', justifyContent: 'space-between', alignItems: 'center' }}>
                                             <span>Access Original Report from <strong>{s.name}</strong></span>
@@ -14,20 +14,143 @@ CREATE TABLE incidents (
     is_verified BOOLEAN DEFAULT false,
     image_url TEXT,
     summary TEXT,
-    -- similarity_hash helps in finding potential duplicates quickly
+    -- similarity_hash: normalized content hash set by the ingest job (also keys its summary cache)
     similarity_hash TEXT,
     prayer_count INTEGER DEFAULT 0
 );
 
--- Index for faster sorting by date
-CREATE INDEX idx_incidents_date ON incidents(incident_date DESC);
+-- Index for the feed's newest-first order and its (incident_date, id) keyset cursor
+DROP INDEX IF EXISTS idx_incidents_date;
+CREATE INDEX idx_incidents_date ON incidents(incident_date DESC, id DESC);
 
--- Index for searching title and description
-CREATE INDEX idx_incidents_search ON incidents USING GIN (to_tsvector('english', title || ' ' || description));
+-- What a feed card shows: no summary, source names without URLs, a description excerpt.
+-- Full rows are loaded one at a time when an incident is opened.
+CREATE OR REPLACE VIEW incident_cards AS
+SELECT id, incident_date, title, location_raw, image_url, is_verified, prayer_count,
+       left(description, 400) AS excerpt,
+       ARRAY(SELECT src->>'name' FROM jsonb_array_elements(sources) AS src) AS source_names
+FROM incidents;
+
+-- One feed page, newest first. Pass the last card's (incident_date, id) to get the next page;
+-- unlike OFFSET, deep pages cost the same as the first.
+CREATE OR REPLACE FUNCTION list_incidents(
+    p_since TIMESTAMPTZ DEFAULT NULL,
+    p_before_date TIMESTAMPTZ DEFAULT NULL,
+    p_before_id UUID DEFAULT NULL,
+    p_limit INTEGER DEFAULT 12
+)
+RETURNS SETOF incident_cards AS $$
+    SELECT c.*
+    FROM incident_cards AS c
+    WHERE (p_since IS NULL OR c.incident_date >= p_since)
+      AND (p_before_date IS NULL OR (c.incident_date, c.id) < (p_before_date, p_before_id))
+    ORDER BY c.incident_date DESC, c.id DESC
+    LIMIT p_limit;
+$$ LANGUAGE sql STABLE;
+
+-- Full-text search document, kept up to date by Postgres on every insert/update (never written directly)
+ALTER TABLE incidents ADD COLUMN IF NOT EXISTS search_vector TSVECTOR GENERATED ALWAYS AS (
+    setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+    setweight(to_tsvector('english', coalesce(summary, '')), 'B') ||
+    setweight(to_tsvector('english', coalesce(location_raw, '')), 'B') ||
+    setweight(to_tsvector('english', coalesce(description, '')), 'C')
+) STORED;
+
+-- Index for full-text search (title, summary, location and description)
+DROP INDEX IF EXISTS idx_incidents_search;
+CREATE INDEX idx_incidents_search ON incidents USING GIN (search_vector);
+
+-- Ranked, paginated full-text search for the incident feed. p_query takes web-search syntax
+-- ("quoted phrases", or, -excluded); a trailing bare word also matches as a prefix, so a half-typed
+-- "Odi" finds Odisha. Equal ranks are ordered newest first. Returns feed cards.
+DROP FUNCTION IF EXISTS search_incidents(TEXT, TIMESTAMPTZ, INTEGER, INTEGER);
+CREATE OR REPLACE FUNCTION search_incidents(
+    p_query TEXT,
+    p_since TIMESTAMPTZ DEFAULT NULL,
+    p_limit INTEGER DEFAULT 12,
+    p_offset INTEGER DEFAULT 0
+)
+RETURNS TABLE (
+    id UUID, incident_date TIMESTAMPTZ, title TEXT, location_raw TEXT, image_url TEXT,
+    is_verified BOOLEAN, prayer_count INTEGER, excerpt TEXT, source_names TEXT[], rank REAL
+) AS $$
+    SELECT c.id, c.incident_date, c.title, c.location_raw, c.image_url,
+           c.is_verified, c.prayer_count, c.excerpt, c.source_names, ts_rank_cd(i.search_vector, s.q) AS rank
+    FROM incidents AS i
+    JOIN incident_cards AS c ON c.id = i.id,
+         (
+             SELECT websearch_to_tsquery('english', left(p_query, length(p_query) - length(t.word)))
+                    && CASE WHEN t.word = '' THEN ''::tsquery ELSE to_tsquery('english', t.word || ':*') END AS q
+             -- Only letters and digits are kept, so the word can't inject tsquery operators
+             FROM (SELECT COALESCE(substring(p_query FROM '(?:^|\s)([[:alnum:]]+)$'), '') AS word) AS t
+         ) AS s
+    WHERE i.search_vector @@ s.q
+      AND (p_since IS NULL OR i.incident_date >= p_since)
+    ORDER BY rank DESC, i.incident_date DESC, i.id
+    LIMIT p_limit OFFSET p_offset;
+$$ LANGUAGE sql STABLE;
 
 -- Index for the JSONB sources (to prevent duplicate URLs across different incidents)
 CREATE INDEX idx_incidents_source_urls ON incidents USING GIN (sources);
 
+-- Unique content hash: summary cache lookups, and the ingest job's idempotent upserts (NULLs never conflict)
+DROP INDEX IF EXISTS idx_incidents_similarity_hash;
+CREATE UNIQUE INDEX idx_incidents_similarity_hash ON incidents(similarity_hash);
+
+-- All source URLs of incidents created since p_since, for the ingest job's in-memory dedup
+CREATE OR REPLACE FUNCTION get_known_source_urls(p_since TIMESTAMPTZ)
+RETURNS TEXT[] AS $$
+    SELECT COALESCE(array_agg(DISTINCT src->>'url'), '{}')
+    FROM incidents, jsonb_array_elements(sources) AS src
+    WHERE created_at >= p_since AND src->>'url' IS NOT NULL;
+$$ LANGUAGE sql STABLE;
+
+-- Inserts new incidents, skipping any whose similarity_hash is already stored (so a retried batch is a no-op).
+-- Returns one row per stored hash in the batch: the new id (inserted = true), or the id of the incident
+-- that already had that content (inserted = false), which the ingest job adds its sources to instead.
+CREATE OR REPLACE FUNCTION insert_incidents(p_incidents JSONB)
+RETURNS TABLE (similarity_hash TEXT, id UUID, inserted BOOLEAN) AS $$
+    WITH new_rows AS (
+        SELECT * FROM jsonb_to_recordset(p_incidents) AS r(
+            incident_date TIMESTAMPTZ, title TEXT, description TEXT, location_raw TEXT, sources JSONB,
+            is_verified BOOLEAN, image_url TEXT, summary TEXT, similarity_hash TEXT
+        )
+    ), added AS (
+        INSERT INTO incidents (incident_date, title, description, location_raw, sources,
+                               is_verified, image_url, summary, similarity_hash)
+        SELECT incident_date, title, description, location_raw, COALESCE(sources, '[]'::jsonb),
+               COALESCE(is_verified, false), image_url, summary, similarity_hash
+        FROM new_rows
+        ON CONFLICT (similarity_hash) DO NOTHING
+        RETURNING incidents.similarity_hash, incidents.id
+    )
+    SELECT a.similarity_hash, a.id, true FROM added AS a
+    UNION ALL
+    -- The statement's snapshot predates the INSERT, so this only finds incidents stored earlier
+    SELECT DISTINCT i.similarity_hash, i.id, false
+    FROM new_rows AS n JOIN incidents AS i ON i.similarity_hash = n.similarity_hash;
+$$ LANGUAGE sql;
+
+-- Appends grouped sources (skipping URLs already present) and fills a missing image, for many incidents
+-- in one call. The append happens inside the UPDATE, so concurrent runs cannot overwrite each other.
+-- p_updates: [{ "id": "...", "sources": [{ "name": "...", "url": "..." }], "image_url": "..." | null }]
+CREATE OR REPLACE FUNCTION apply_incident_updates(p_updates JSONB)
+RETURNS INTEGER AS $$
+    WITH updated AS (
+        UPDATE incidents AS i
+        SET sources = i.sources || COALESCE((
+                SELECT jsonb_agg(src)
+                FROM jsonb_array_elements(u.sources) AS src
+                WHERE NOT i.sources @> jsonb_build_array(jsonb_build_object('url', src->'url'))
+            ), '[]'::jsonb),
+            image_url = COALESCE(i.image_url, u.image_url)
+        FROM jsonb_to_recordset(p_updates) AS u(id UUID, sources JSONB, image_url TEXT)
+        WHERE i.id = u.id
+        RETURNING 1
+    )
+    SELECT count(*)::INTEGER FROM updated;
+$$ LANGUAGE sql;
+
 -- Table for Dynamic Crawler Sources
 CREATE TABLE crawler_sources (
     id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
@@ -38,6 +161,31 @@ CREATE TABLE crawler_sources (
     is_active BOOLEAN DEFAULT true
 );
 
+-- Conditional GET validators so unchanged feeds are skipped by the ingest job
+ALTER TABLE crawler_sources ADD COLUMN IF NOT EXISTS etag TEXT;
+ALTER TABLE crawler_sources ADD COLUMN IF NOT EXISTS last_modified TEXT;
+ALTER TABLE crawler_sources ADD COLUMN IF NOT EXISTS content_hash TEXT;
+
+-- Entries already evaluated by the ingest job, so rejected items are not re-scraped on later runs
+CREATE TABLE IF NOT EXISTS seen_entries (
+    entry_key TEXT PRIMARY KEY, -- sha256 of normalized link + content hash
+    link TEXT NOT NULL,
+    outcome TEXT NOT NULL, -- 'accepted', 'grouped', 'rejected'
+    reason TEXT, -- why it was rejected: 'not_india', 'not_relevant', 'negative'
+    first_seen TIMESTAMPTZ DEFAULT now(),
+    last_seen TIMESTAMPTZ DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS idx_seen_entries_last_seen ON seen_entries(last_seen DESC);
+
+-- Internal to the ingest job (service role only)
+ALTER TABLE seen_entries ENABLE ROW LEVEL SECURITY;
+
+CREATE OR REPLACE FUNCTION get_seen_entry_keys(p_since TIMESTAMPTZ)
+RETURNS TEXT[] AS $$
+    SELECT COALESCE(array_agg(entry_key), '{}') FROM seen_entries WHERE last_seen >= p_since;
+$$ LANGUAGE sql STABLE;
+
 -- Table for Admin Users (Simple Auth)
 CREATE TABLE dashboard_users (
     id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
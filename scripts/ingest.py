@@ -1,16 +1,34 @@
-import feedparser
 import os
 import time
 import re
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3 import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.retry import Retry
+from html.parser import HTMLParser
 from datetime import datetime, timedelta, timezone
-from supabase import create_client, Client
 from dateutil import parser as date_parser
-from thefuzz import fuzz
-from google import genai
 from dotenv import load_dotenv
-import random
+from importlib.util import find_spec
+from typing import TYPE_CHECKING
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from collections import deque
+from contextlib import contextmanager
+from urllib.parse import urlparse, urlsplit, urlunsplit, parse_qsl, urlencode
+import threading
+import hashlib
+import tempfile
+import sqlite3
+import zlib
+import json
+import atexit
+import argparse
+
+# feedparser, bs4, thefuzz, lxml, supabase and google.genai are imported where they are
+# first used, so importing this module stays cheap (see test/test_import_time.py)
+if TYPE_CHECKING:
+    from supabase import Client
+HAS_LXML = find_spec("lxml") is not None # Falls back to BeautifulSoup's html.parser
 
 # Load environment variables
 load_dotenv()
@@ -20,94 +38,564 @@ SUPABASE_URL = os.environ.get("SUPABASE_URL")
 SUPABASE_KEY = os.environ.get("SUPABASE_SECRET_KEY")
 GEMINI_API_KEYS = [k.strip() for k in os.environ.get("GEMINI_API_KEY", "").split(",") if k.strip()]
 
+# Local caches live here; the ingest workflow persists this directory between runs
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+CACHE_DIR = os.environ.get("INGEST_CACHE_DIR", os.path.join(PROJECT_ROOT, ".cache", "ingest"))
+
+# Event Logging
+LOG_FLUSH_SIZE = 20 # Buffered events that wake the flush thread early
+LOG_FLUSH_INTERVAL = 5 # Seconds between background flushes
+LOG_SPOOL_FILE = "log_spool.jsonl" # In CACHE_DIR: events the DB could not take, replayed on the next flush
+LOG_SPOOL_MAX_EVENTS = 5000 # Oldest spooled events are dropped past this
+
 class LogManager:
-    def __init__(self, supabase_client: Client):
+    """Buffers ingestion events and writes them to system_events from a background thread.
+
+    log() only appends to an in-memory buffer. A daemon thread inserts the buffer
+    in one request every LOG_FLUSH_INTERVAL seconds, or sooner once LOG_FLUSH_SIZE
+    events are waiting, and whatever is left is flushed at process exit. Batches
+    the DB rejects go to a local spool file and are retried with the next flush.
+    """
+    def __init__(self, supabase_client: "Client" = None, flush_size=LOG_FLUSH_SIZE, flush_interval=LOG_FLUSH_INTERVAL):
+        # Without a client one is built on the first flush, if credentials are configured
         self.supabase = supabase_client
+        self.enabled = bool(supabase_client) or bool(SUPABASE_URL and SUPABASE_KEY)
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.spool_path = os.path.join(CACHE_DIR, LOG_SPOOL_FILE)
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        if self.enabled:
+            atexit.register(self.flush)
 
     def log(self, name, severity="INFO", metadata=None):
-        """Sends an ingestion event to Supabase."""
-        if not self.supabase:
+        """Queues an ingestion event for Supabase."""
+        if not self.enabled:
             return
+        event = {
+            "event_type": "INGESTION",
+            "event_name": name,
+            "severity": severity,
+            # Round-tripped so the spool can always serialize it, stamped now rather than at flush time
+            "metadata": json.loads(json.dumps(metadata or {}, default=str)),
+            "created_at": datetime.now(timezone.utc).isoformat()
+        }
+        with self._lock:
+            self._buffer.append(event)
+            waiting = len(self._buffer)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="log-flush", daemon=True)
+                self._thread.start()
+        if waiting >= self.flush_size:
+            self._wake.set()
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def _read_spool(self):
         try:
-            event = {
-                "event_type": "INGESTION",
-                "event_name": name,
-                "severity": severity,
-                "metadata": metadata or {}
-            }
-            self.supabase.table("system_events").insert(event).execute()
+            with open(self.spool_path, encoding="utf-8") as f:
+                return [json.loads(line) for line in f if line.strip()]
+        except FileNotFoundError:
+            return []
         except Exception as e:
-            print(f"Logging Error: {e}")
+            print(f"Error reading log spool: {e}")
+            return []
+
+    def _write_spool(self, events):
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            tmp_path = f"{self.spool_path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                for event in events[-LOG_SPOOL_MAX_EVENTS:]:
+                    f.write(json.dumps(event) + "\n")
+            os.replace(tmp_path, self.spool_path)
+        except Exception as e:
+            print(f"Error writing log spool: {e}")
+
+    def flush(self):
+        """Inserts spooled and buffered events in one request, spooling them again if it fails."""
+        with self._flush_lock:
+            with self._lock:
+                events, self._buffer = self._buffer, []
+            spooled = self._read_spool()
+            batch = spooled + events
+            if not batch:
+                return
+            try:
+                if self.supabase is None:
+                    self.supabase = init_supabase()
+                self.supabase.table("system_events").insert(batch).execute()
+                if spooled:
+                    os.remove(self.spool_path)
+            except Exception as e:
+                print(f"Logging Error: {e}")
+                self._write_spool(batch)
+
+# Initialize Logger (connects on its first flush)
+logger = LogManager()
+
+class RunStats:
+    """Timings and counters for one ingest run, sent as a single run_summary event.
+
+    Stage times are exclusive: the time the pipeline spent inside a stage's own
+    code (or waiting on its thread pool), not in the stages upstream of it.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started = time.perf_counter()
+        self.counters = {}
+        self.stages = {}
+        self.sources = {}
+
+    def incr(self, name, amount=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def stage(self, name, seconds, items_in, items_out):
+        with self._lock:
+            self.stages[name] = {"seconds": round(seconds, 3), "in": items_in, "out": items_out}
+
+    def source(self, name, seconds, entries):
+        with self._lock:
+            self.sources[name] = {"seconds": round(seconds, 3), "entries": entries}
+
+    def instrument(self, name, stage, upstream=None):
+        """Runs a stage generator, recording its exclusive time and items in and out."""
+        upstream_seconds = 0.0
+        items_in = 0
+
+        def timed_upstream():
+            nonlocal upstream_seconds, items_in
+            iterator = iter(upstream)
+            while True:
+                started = time.perf_counter()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    upstream_seconds += time.perf_counter() - started
+                    return
+                upstream_seconds += time.perf_counter() - started
+                items_in += 1
+                yield item
+
+        iterator = iter(stage(timed_upstream()) if upstream is not None else stage())
+        total, items_out = 0.0, 0
+        while True:
+            started = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                total += time.perf_counter() - started
+                break
+            total += time.perf_counter() - started
+            items_out += 1
+            yield item
+        self.stage(name, total - upstream_seconds, items_in if upstream is not None else None, items_out)
+
+    def summary(self):
+        with self._lock:
+            stages = dict(self.stages)
+            counters = dict(self.counters)
+            sources = dict(self.sources)
+        slowest = sorted(sources.items(), key=lambda kv: kv[1]["seconds"], reverse=True)
+        return {
+            "wall_seconds": round(time.perf_counter() - self.started, 3),
+            "stages": stages,
+            # Entries each filter dropped (stage input minus output)
+            "dropped": {name: st["in"] - st["out"] for name, st in stages.items() if st["in"] is not None and st["in"] > st["out"]},
+            "counters": counters,
+            "sources": dict(slowest),
+        }
+
+# Shared run telemetry
+run_stats = RunStats()
+
+def load_cache_json(name, default):
+    """Reads a JSON state file from CACHE_DIR, returning default if it is missing or corrupt."""
+    try:
+        with open(os.path.join(CACHE_DIR, name), encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return default
+
+# Serializes state file writes: callers may save from worker threads
+CACHE_WRITE_LOCK = threading.Lock()
+
+def save_cache_json(name, data):
+    """Atomically writes a JSON state file to CACHE_DIR."""
+    path = os.path.join(CACHE_DIR, name)
+    tmp_path = None
+    try:
+        with CACHE_WRITE_LOCK:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            # Unique temp file, so a concurrent writer (another process) cannot interleave with this one
+            fd, tmp_path = tempfile.mkstemp(prefix=f"{name}.", suffix=".tmp", dir=CACHE_DIR)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, path)
+    except Exception as e:
+        print(f"Error saving {name}: {e}")
+        if tmp_path and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+class JsonStateFile:
+    """State kept in a JSON file in CACHE_DIR: read on first use, written back atomically by save().
+
+    Subclasses read and change self._load() while holding self._lock, and
+    override _snapshot() to choose what save() writes.
+    """
+    def __init__(self, file_name):
+        self.file_name = file_name
+        self._lock = threading.Lock()
+        self._entries = None
+
+    def _load(self):
+        if self._entries is None:
+            self._entries = load_cache_json(self.file_name, {})
+        return self._entries
+
+    def _snapshot(self, entries):
+        """Returns the entries save() writes; called with the lock held."""
+        return dict(entries)
+
+    def save(self):
+        with self._lock:
+            entries = self._snapshot(self._load())
+        save_cache_json(self.file_name, entries)
+
+class JsonCache(JsonStateFile):
+    """A JsonStateFile of timestamped entries ({..., "at": epoch seconds}) that counts lookups.
+
+    save() drops entries older than max_age seconds.
+    """
+    max_age = None
+
+    def __init__(self, file_name):
+        super().__init__(file_name)
+        self.hits = 0
+        self.misses = 0
+
+    def _snapshot(self, entries):
+        now = time.time()
+        return {k: e for k, e in entries.items() if now - e["at"] <= self.max_age}
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses}
+
+# Gemini Rate Limits (free tier, per API key and model)
+# batch_tokens is the prompt budget one summarization request is packed up to
+GEMINI_MODEL_LIMITS = {
+    "gemini-2.5-flash": {"rpm": 10, "tpm": 250000, "batch_tokens": 12000},
+    "gemini-2.0-flash": {"rpm": 15, "tpm": 1000000, "batch_tokens": 12000},
+    "gemini-flash-latest": {"rpm": 10, "tpm": 250000, "batch_tokens": 12000},
+    "gemini-2.5-flash-lite": {"rpm": 15, "tpm": 250000, "batch_tokens": 8000}
+}
+GEMINI_DEFAULT_LIMITS = {"rpm": 10, "tpm": 250000, "batch_tokens": 8000}
+GEMINI_DEFAULT_RETRY_AFTER = 60 # Seconds a (key, model) pair rests after a 429 without a hint
+GEMINI_NOT_FOUND_BLOCK = 3600 # Seconds a missing model is skipped for
+GEMINI_MAX_WAIT = 180 # Give up (and fall back to raw descriptions) rather than wait longer for quota
+GEMINI_WORKERS_PER_KEY = 2 # Summarization batches in flight per API key
+
+# Gemini Circuit Breaker (per API key and model)
+GEMINI_BREAKER_THRESHOLD = 3 # Consecutive unexpected errors before a pair is skipped
+GEMINI_BREAKER_COOLDOWN = 60 # First cooldown (seconds); doubles each time a half-open probe fails
+GEMINI_BREAKER_MAX_COOLDOWN = 1800 # Cap for the doubling cooldown
+GEMINI_HEALTH_DECAY = 0.3 # Weight of the newest call in the success-rate and latency averages
+GEMINI_HEALTH_RECOVERY = 600 # Seconds for half of a pair's lost success rate to recover when it goes unused
+
+# Summarization Batching
+SUMMARY_MAX_ITEMS = 10 # Incidents per request, whatever the token budget allows
+SUMMARY_OUTPUT_TOKENS = 400 # Reserved per incident for its 10-line summary
+SUMMARY_MIN_CHARS = 20 # Shorter summaries are treated as invalid and re-queued
+SUMMARY_MAX_ATTEMPTS = 2 # Requests per incident before falling back to its raw description
+SUMMARY_SCHEMA = {
+    "type": "ARRAY",
+    "items": {
+        "type": "OBJECT",
+        "properties": {"id": {"type": "STRING"}, "summary": {"type": "STRING"}},
+        "required": ["id", "summary"]
+    }
+}
+
+RETRY_AFTER_HINTS = [
+    re.compile(r"retryDelay['\"]?\s*:\s*['\"]?([\d.]+)s", re.IGNORECASE),
+    re.compile(r"retry in ([\d.]+)\s*s", re.IGNORECASE)
+]
+
+def parse_retry_after(error):
+    """Extracts the retry delay (seconds) a 429 error suggests, if any."""
+    message = str(error)
+    for pattern in RETRY_AFTER_HINTS:
+        match = pattern.search(message)
+        if match:
+            return float(match.group(1))
+    return None
+
+class TokenBucket:
+    """Allows `per_minute` units per rolling minute, refilled continuously."""
+    def __init__(self, per_minute):
+        self.capacity = per_minute
+        self.tokens = float(per_minute)
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.capacity / 60)
+        self.updated = now
+
+    def wait_time(self, amount):
+        """Seconds until `amount` units are available (0 if they are now)."""
+        self._refill()
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0
+        return (amount - self.tokens) * 60 / self.capacity
+
+    def take(self, amount):
+        self.tokens -= min(amount, self.capacity)
+
+class GeminiScheduler:
+    """Hands out (key, model) pairs within each pair's RPM and TPM budget.
+
+    Callers only sleep when every pair is out of quota, and only until the first frees up.
+    """
+    def __init__(self, api_keys, models, limits=GEMINI_MODEL_LIMITS):
+        self._lock = threading.Lock()
+        self.buckets = {}
+        for key in api_keys:
+            for model in models:
+                model_limits = limits.get(model, GEMINI_DEFAULT_LIMITS)
+                self.buckets[(key, model)] = (TokenBucket(model_limits["rpm"]), TokenBucket(model_limits["tpm"]))
+
+    def try_acquire(self, key, model, tokens):
+        """Reserves one request and `tokens` tokens; returns 0 on success or the seconds to wait."""
+        with self._lock:
+            requests_bucket, tokens_bucket = self.buckets[(key, model)]
+            wait = max(requests_bucket.wait_time(1), tokens_bucket.wait_time(tokens))
+            if wait == 0:
+                requests_bucket.take(1)
+                tokens_bucket.take(tokens)
+            return wait
 
-# Initialize Supabase
-supabase: Client = None
-if SUPABASE_URL and SUPABASE_KEY:
-    supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+class GeminiHealth(JsonStateFile):
+    """Circuit breaker and recent-performance record for every (key, model) pair.
 
-# Initialize Logger
-logger = LogManager(supabase)
+    A pair that returns a 429/404, or fails GEMINI_BREAKER_THRESHOLD times in a
+    row, is opened and skipped until its cooldown expires. One caller then gets
+    a half-open probe: success closes the breaker, failure reopens it with a
+    doubled cooldown. State is saved to CACHE_DIR between runs, keyed by a hash
+    of the API key so raw keys never touch disk.
+
+    A lowered success rate drifts back toward 1.0 while the pair goes unused, so
+    a model demoted by a burst of 429s is tried again once its quota has reset.
+    """
+    def __init__(self, name="gemini_health.json"):
+        super().__init__(name)
+        self._probing = set()
+
+    @staticmethod
+    def pair_id(key, model):
+        return f"{hashlib.sha256(key.encode('utf-8')).hexdigest()[:12]}:{model}"
+
+    def _entry(self, key, model):
+        return self._load().setdefault(self.pair_id(key, model), {
+            "open_until": 0, "failures": 0, "trips": 0, "success_rate": 1.0, "rated_at": 0, "latency": None
+        })
+
+    @staticmethod
+    def _success_rate(entry, now):
+        """The stored success rate, recovered toward 1.0 for the time since it was last updated."""
+        idle = max(0.0, now - entry.get("rated_at", 0))
+        return 1 - (1 - entry["success_rate"]) * 0.5 ** (idle / GEMINI_HEALTH_RECOVERY)
+
+    def _rate(self, entry, outcome):
+        now = time.time()
+        rate = self._success_rate(entry, now)
+        entry["success_rate"] = rate + GEMINI_HEALTH_DECAY * (outcome - rate)
+        entry["rated_at"] = now
+
+    def retry_in(self, key, model):
+        """Seconds until the pair may be tried (0 if it may be tried now, claiming the half-open probe)."""
+        with self._lock:
+            entry = self._entry(key, model)
+            if not entry["trips"]:
+                return 0
+            remaining = entry["open_until"] - time.time()
+            if remaining > 0:
+                return remaining
+            pair = (key, model)
+            if pair in self._probing:
+                return GEMINI_BREAKER_COOLDOWN / 4 # Another caller is probing it
+            self._probing.add(pair)
+            return 0
+
+    def record_success(self, key, model, latency):
+        with self._lock:
+            entry = self._entry(key, model)
+            self._probing.discard((key, model))
+            entry.update(open_until=0, failures=0, trips=0)
+            self._rate(entry, 1.0)
+            previous = entry["latency"]
+            entry["latency"] = latency if previous is None else previous + GEMINI_HEALTH_DECAY * (latency - previous)
+
+    def record_failure(self, key, model, cooldown=None):
+        """Counts a failure, opening the breaker on a 429/404 (cooldown given) or too many in a row.
+
+        Returns the cooldown if this call opened the breaker, else None.
+        """
+        with self._lock:
+            entry = self._entry(key, model)
+            probing = (key, model) in self._probing
+            self._probing.discard((key, model))
+            entry["failures"] += 1
+            self._rate(entry, 0.0)
+            if entry["open_until"] > time.time():
+                return None # Already open (another caller tripped it first)
+            if cooldown is None and not probing and entry["failures"] < GEMINI_BREAKER_THRESHOLD:
+                return None
+            # The first opening honours the API's retry hint; reopenings back off exponentially
+            backoff = min(GEMINI_BREAKER_MAX_COOLDOWN, GEMINI_BREAKER_COOLDOWN * 2 ** entry["trips"])
+            if cooldown is None or entry["trips"]:
+                cooldown = max(cooldown or 0, backoff)
+            entry["trips"] += 1
+            entry["open_until"] = time.time() + cooldown
+            return cooldown
+
+    def release(self, key, model):
+        """Gives back a half-open probe that was claimed but not used."""
+        with self._lock:
+            self._probing.discard((key, model))
+
+    def rank(self, pairs):
+        """Orders pairs by breaker state and recent success rate, then model preference (the given order).
+
+        Latency only breaks ties between keys of the same model, rounded to whole
+        seconds so near-equal keys keep their rotation order. A key with no latency
+        yet counts as its model's average, neither ahead of nor behind proven keys.
+        """
+        now = time.time()
+        preference = {}
+        for _, model in pairs:
+            preference.setdefault(model, len(preference))
+        with self._lock:
+            entries = {pair: self._entry(*pair) for pair in pairs}
+            known = {}
+            for (_, model), entry in entries.items():
+                if entry["latency"] is not None:
+                    known.setdefault(model, []).append(entry["latency"])
+
+            def score(pair):
+                entry, model = entries[pair], pair[1]
+                latency = entry["latency"]
+                if latency is None:
+                    latency = sum(known[model]) / len(known[model]) if model in known else 0
+                return (entry["open_until"] > now, -round(self._success_rate(entry, now), 1), preference[model], round(latency))
+            return sorted(pairs, key=score)
 
 class GeminiManager:
     def __init__(self, api_keys):
         self.api_keys = api_keys
-        self.current_key_index = 0
         # Models confirmed available for the user's API key
         self.models = ["gemini-2.5-flash", "gemini-2.0-flash", "gemini-flash-latest", "gemini-2.5-flash-lite"]
-        self.current_model_index = 0
         self.clients = {} # Cache clients for each key
+        self.scheduler = GeminiScheduler(api_keys, self.models)
+        self.health = GeminiHealth()
+        self._lock = threading.Lock()
+        self._next_key = 0
         
     def get_client(self, api_key):
-        if api_key not in self.clients:
-            try:
-                # Removing api_version='v1' to allow access to more models
-                self.clients[api_key] = genai.Client(api_key=api_key)
-            except Exception as e:
-                print(f"Error initializing Gemini Client for key ...{api_key[-4:]}: {e}")
-                return None
-        return self.clients[api_key]
+        with self._lock:
+            if api_key not in self.clients:
+                try:
+                    # Removing api_version='v1' to allow access to more models
+                    from google import genai
+                    self.clients[api_key] = genai.Client(api_key=api_key)
+                except Exception as e:
+                    print(f"Error initializing Gemini Client for key ...{api_key[-4:]}: {e}")
+                    self.clients[api_key] = None
+            return self.clients[api_key]
 
-    def call_with_fallback(self, func, *args, **kwargs):
-        """Executes a function with model fallback and key rotation."""
+    def candidates(self):
+        """(key, model) pairs ranked by recent health, rotating the starting key so parallel calls spread out."""
+        with self._lock:
+            start = self._next_key
+            self._next_key = (self._next_key + 1) % len(self.api_keys)
+        keys = self.api_keys[start:] + self.api_keys[:start]
+        return self.health.rank([(key, model) for model in self.models for key in keys])
+
+    def call_with_fallback(self, func, *args, est_tokens=1000, **kwargs):
+        """Executes a function with model fallback and key rotation, within each pair's rate limits."""
         last_exception = None
-        
-        # Try each key
-        for _ in range(len(self.api_keys)):
-            api_key = self.api_keys[self.current_key_index]
-            client = self.get_client(api_key)
-            
-            if not client:
-                self.current_key_index = (self.current_key_index + 1) % len(self.api_keys)
-                continue
+        deadline = time.monotonic() + GEMINI_MAX_WAIT
+        candidates = [(k, m) for k, m in self.candidates() if self.get_client(k)]
+        if not candidates:
+            raise Exception("No valid Gemini API keys or models available.")
 
-            # Try each model starting from the best one
-            for model_index in range(len(self.models)):
-                model_name = self.models[model_index]
+        while True:
+            shortest_wait = None
+            for api_key, model_name in candidates:
+                # Open breakers are skipped; out-of-quota pairs are too, releasing a claimed probe
+                wait = self.health.retry_in(api_key, model_name)
+                if wait == 0:
+                    wait = self.scheduler.try_acquire(api_key, model_name, est_tokens)
+                    if wait > 0:
+                        self.health.release(api_key, model_name)
+                if wait > 0:
+                    shortest_wait = wait if shortest_wait is None else min(shortest_wait, wait)
+                    continue
+                started = time.monotonic()
+                run_stats.incr("gemini_calls")
+                run_stats.incr("gemini_tokens_estimated", est_tokens)
                 try:
-                    return func(client, model_name, *args, **kwargs)
+                    result = func(self.get_client(api_key), model_name, *args, **kwargs)
                 except Exception as e:
+                    run_stats.incr("gemini_errors")
                     last_exception = e
                     err_msg = str(e).upper()
                     # Fallback for rate limits AND not found errors (in case a model list is stale)
                     if any(x in err_msg for x in ["429", "RESOURCE_EXHAUSTED", "404", "NOT_FOUND"]):
-                        print(f"Model {model_name} unavailable ({err_msg}) with key ...{api_key[-4:]}. Trying next fallback...")
-                        logger.log("model_fallback", "WARNING", {
-                            "model": model_name,
-                            "error": str(e),
-                            "key_suffix": api_key[-4:]
-                        })
+                        if any(x in err_msg for x in ["404", "NOT_FOUND"]):
+                            rest = GEMINI_NOT_FOUND_BLOCK
+                        else:
+                            rest = parse_retry_after(e) or GEMINI_DEFAULT_RETRY_AFTER
+                        opened = self.health.record_failure(api_key, model_name, rest)
+                        # Logged once per breaker opening, not once per batch that runs into it
+                        if opened:
+                            run_stats.incr("gemini_fallbacks")
+                            print(f"Model {model_name} unavailable ({err_msg}) with key ...{api_key[-4:]}. Resting it for {opened:.0f}s, trying next fallback...")
+                            logger.log("model_fallback", "WARNING", {
+                                "model": model_name,
+                                "error": str(e),
+                                "key_suffix": api_key[-4:],
+                                "retry_after": opened
+                            })
+                        shortest_wait = rest if shortest_wait is None else min(shortest_wait, rest)
                         continue # Try next model
                     else:
                         # For other unexpected errors, don't bother falling back unless necessary
+                        self.health.record_failure(api_key, model_name)
                         print(f"Gemini Error ({model_name}): {e}")
                         raise e
-            
-            # If all models failed for this key, try next key
-            print(f"All models exhausted for key ...{api_key[-4:]}. Rotating key...")
-            self.current_key_index = (self.current_key_index + 1) % len(self.api_keys)
+                self.health.record_success(api_key, model_name, time.monotonic() - started)
+                return result
+
+            # Every pair is out of quota: wait for the first one to free up
+            if shortest_wait is None or time.monotonic() + shortest_wait > deadline:
+                break
+            print(f"All Gemini keys/models are rate limited. Waiting {shortest_wait:.1f}s for quota...")
+            run_stats.incr("gemini_wait_seconds", round(shortest_wait, 1))
+            time.sleep(shortest_wait)
 
         if last_exception:
             raise last_exception
-        raise Exception("No valid Gemini API keys or models available.")
+        raise Exception("Gemini quota exhausted for every key and model.")
 
 # Initialize Gemini Manager
 gemini_manager = None
@@ -128,6 +616,79 @@ RSS_BRIDGE_INSTANCES = [
     "https://rssbridge.pw"
 ]
 
+# Social Mirror Settings
+MIRROR_TIMEOUT = 7 # Per-request timeout (seconds) against a single mirror
+MIRROR_HEDGE_DELAY = 2.0 # Seconds before the next-ranked mirror is tried alongside a slow one
+MIRROR_HEALTH_DECAY = 0.3 # Weight of the newest request in a mirror's success-rate and latency averages
+MIRROR_WORKERS = 8 # Mirror requests in flight across all social sources
+
+# Fetch Stage Concurrency
+FETCH_WORKERS = 8 # Sources fetched in parallel
+SCRAPE_WORKERS = 8 # Articles deep-scraped in parallel
+STAGE_WINDOW = 16 # Items a concurrent stage works ahead of its consumer (bounds memory)
+PER_HOST_LIMIT = 2 # Max in-flight requests to any single host (e.g. news.google.com)
+
+# Efficiency Settings
+DAYS_LOOKBACK = 3 # Sliding window of publication dates processed each run
+
+# Run Checkpoint Settings
+RUN_STATE_FILE = "run_state.json" # In CACHE_DIR: completed stages, validators and pending incidents
+RUN_ENTRIES_FILE = "run_state_entries.jsonl" # In CACHE_DIR: the fetched raw entries, one per line
+RUN_STATE_MAX_AGE_HOURS = 24 # Older checkpoints are ignored by --resume
+
+# HTTP Client Policy (shared by every fetcher)
+HTTP_POOL_HOSTS = 32 # Distinct hosts kept in the connection pool
+HTTP_RETRIES = 2 # Retries for connection failures and 429/5xx responses
+HTTP_BACKOFF = 0.5 # Exponential backoff factor between retries (seconds)
+
+# Dedup Settings
+KNOWN_URL_LOOKBACK_DAYS = 30 # Source URLs of incidents created in this window are loaded once per run
+
+# Seen-Entry Store Settings
+SEEN_ENTRY_LOOKBACK_DAYS = 7 # Must outlast the date filter window so skipped entries stay skipped
+SEEN_ENTRY_RETENTION_DAYS = 30 # Older seen_entries rows are pruned at the end of each run
+TRACKING_PARAMS = {"oc", "fbclid", "gclid", "ref", "cmpid"} # Dropped (with utm_*) when normalizing links
+
+# Write-Back Settings
+INSERT_CHUNK_SIZE = 200 # Incident rows per insert_incidents call
+UPDATE_CHUNK_SIZE = 500 # Grouped-source updates per apply_incident_updates call
+
+# Grouping Settings
+GROUPING_WINDOW_DAYS = 3 # Recent incidents that new reports can be grouped into
+GROUPING_THRESHOLD = 75 # Minimum fuzz.token_set_ratio for two titles to be the same incident
+GROUPING_MIN_SHARED_TOKENS = 2 # Title tokens a candidate must share before it is fuzzy-scored
+GROUPING_PAGE_SIZE = 1000 # PostgREST max rows per request
+
+# Tokens too common in our feeds to tell incidents apart
+GROUPING_STOPWORDS = {
+    "the", "and", "for", "with", "from", "into", "over", "after", "amid", "against",
+    "india", "indian", "christian", "christians", "social", "update", "news"
+}
+
+# Redirect Cache Settings
+REDIRECTORS = ["news.google.com", "t.co", "bit.ly", "tinyurl.com"]
+REDIRECT_CACHE_TTL_DAYS = 30 # Short URL -> final URL mappings are stable
+REDIRECT_FAILURE_TTL_HOURS = 6 # Failed lookups are retried after this long
+REDIRECT_SNIFF_BYTES = 64 * 1024 # Bytes read looking for a meta refresh
+
+# Article Extraction Settings
+ARTICLE_MAX_BYTES = 2 * 1024 * 1024 # Stop downloading an article page past this size
+ARTICLE_MAX_CHARS = 5000 # Limit to 5k chars for prompt efficiency
+NOISE_TAGS = ["script", "style", "nav", "footer", "header", "aside"]
+# Try to find the main content block (common news tags), in priority order
+CONTENT_SELECTORS = [
+    'div.entry-content', 'div.article-body', 'div.story-content',
+    'article', 'main', 'div.post-content'
+]
+
+# Article Cache Settings
+ARTICLE_CACHE_TTL_DAYS = 14 # Scraped bodies older than this are fetched again
+ARTICLE_CACHE_MAX_MB = 50 # Least recently used bodies are evicted above this size
+
+# Summary Cache Settings
+SUMMARY_CACHE_TTL_DAYS = 30 # Locally cached summaries older than this are dropped
+SUMMARY_CACHE_QUERY_CHUNK = 50 # Hashes per incidents lookup (keeps the request URL short)
+
 # Browser-like headers to avoid 403s
 DEFAULT_HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
@@ -138,6 +699,190 @@ DEFAULT_HEADERS = {
     "Upgrade-Insecure-Requests": "1"
 }
 
+class CountingAdapter(HTTPAdapter):
+    """HTTPAdapter whose connection pools call on_connect for every connection they open.
+
+    Pools evicted from the PoolManager take their connection counts with them,
+    so a running count is the only reliable total.
+    """
+    def __init__(self, on_connect, **kwargs):
+        self.on_connect = on_connect # Set first: HTTPAdapter.__init__ builds the pool manager
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        on_connect = self.on_connect
+
+        def counting(pool_class):
+            class CountingPool(pool_class):
+                def _new_conn(self):
+                    on_connect()
+                    return super()._new_conn()
+            return CountingPool
+
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": counting(HTTPConnectionPool), "https": counting(HTTPSConnectionPool)
+        }
+
+class HttpClient:
+    """Pooled HTTP client shared by every network call in an ingest run.
+
+    Keeps keep-alive connections per host, applies one retry/backoff policy,
+    caps in-flight requests per host and counts traffic for the run summary.
+    """
+    def __init__(self, per_host_limit=PER_HOST_LIMIT, pool_hosts=HTTP_POOL_HOSTS):
+        self.per_host_limit = per_host_limit
+        self.session = requests.Session()
+        self.session.headers.update(DEFAULT_HEADERS)
+        # Read timeouts are not retried: a slow mirror should fail over, not stall
+        retry = Retry(
+            total=HTTP_RETRIES,
+            connect=1,
+            read=0,
+            status=HTTP_RETRIES,
+            backoff_factor=HTTP_BACKOFF,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=["GET", "HEAD"],
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        adapter = CountingAdapter(self._connected, pool_connections=pool_hosts, pool_maxsize=per_host_limit, max_retries=retry)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self._lock = threading.Lock()
+        self._host_semaphores = {}
+        self.requests_made = 0
+        self.bytes_received = 0
+        self.errors = 0
+        self.connections = 0
+
+    @contextmanager
+    def host_slot(self, url):
+        """Caps the number of concurrent requests to a single host."""
+        host = urlparse(url).netloc.lower()
+        with self._lock:
+            if host not in self._host_semaphores:
+                self._host_semaphores[host] = threading.BoundedSemaphore(self.per_host_limit)
+            semaphore = self._host_semaphores[host]
+        with semaphore:
+            yield
+
+    def request(self, method, url, **kwargs):
+        with self.host_slot(url):
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except Exception:
+                with self._lock:
+                    self.requests_made += 1
+                    self.errors += 1
+                raise
+            # Streamed bodies are counted by the caller via record_bytes()
+            size = 0 if kwargs.get("stream") else len(response.content)
+        with self._lock:
+            self.requests_made += 1
+            self.bytes_received += size
+        return response
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def head(self, url, **kwargs):
+        return self.request("HEAD", url, **kwargs)
+
+    def record_bytes(self, size):
+        with self._lock:
+            self.bytes_received += size
+
+    def _connected(self):
+        with self._lock:
+            self.connections += 1
+
+    def stats(self):
+        """Returns traffic counters, including how often a pooled connection was reused."""
+        with self._lock:
+            requests_made, opened = self.requests_made, self.connections
+            stats = {
+                "requests": requests_made,
+                "errors": self.errors,
+                "bytes": self.bytes_received,
+                "connections_opened": opened
+            }
+        stats["reuse_ratio"] = round(max(0.0, 1 - opened / requests_made), 3) if requests_made else 0.0
+        return stats
+
+# Shared HTTP client for the whole run
+http_client = HttpClient()
+
+# Feed-level timestamps that change on every request even when no item did
+FEED_VOLATILE_TAGS = re.compile(r'<(lastBuildDate|updated)>.*?</\1>', re.DOTALL)
+
+class FeedCache:
+    """Conditional GET cache for feeds, backed by the validators stored on crawler_sources rows.
+
+    New validators are only written back via flush() once the run has processed
+    the entries, so a crashed run never marks unseen items as already fetched.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.pending = {}
+        self.hits = 0
+        self.misses = 0
+
+    def request_headers(self, source):
+        headers = {}
+        if source.get('etag'):
+            headers['If-None-Match'] = source['etag']
+        if source.get('last_modified'):
+            headers['If-Modified-Since'] = source['last_modified']
+        return headers
+
+    def is_unchanged(self, source, response):
+        """True if the response is a 304 or its body hashes to the stored content_hash."""
+        if response.status_code == 304:
+            with self._lock:
+                self.hits += 1
+            return True
+        if response.status_code != 200:
+            return False
+
+        normalized = FEED_VOLATILE_TAGS.sub('', response.text)
+        content_hash = hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+        validators = {
+            "etag": response.headers.get('ETag'),
+            "last_modified": response.headers.get('Last-Modified'),
+            "content_hash": content_hash
+        }
+        unchanged = bool(source.get('content_hash')) and source['content_hash'] == content_hash
+        with self._lock:
+            if unchanged:
+                self.hits += 1
+            else:
+                self.misses += 1
+            if source.get('id') and any(source.get(k) != v for k, v in validators.items()):
+                self.pending[source['id']] = validators
+        return unchanged
+
+    def flush(self, supabase, skip=()):
+        """Persists the validators collected during this run back to crawler_sources.
+
+        Sources in skip (their entries did not all get written) keep their old
+        validators, so the next run fetches and processes them again.
+        """
+        with self._lock:
+            pending, self.pending = self.pending, {}
+        for source_id, validators in pending.items():
+            if source_id in skip:
+                continue
+            try:
+                supabase.table("crawler_sources").update(validators).eq("id", source_id).execute()
+            except Exception as e:
+                print(f"Error saving feed cache for source {source_id}: {e}")
+                break # Most likely the validator columns are not migrated yet
+
+# Shared feed cache for the whole run
+feed_cache = FeedCache()
+
 # Indian State and Major Region keywords
 INDIAN_LOCATIONS = {
     "Andhra Pradesh": ["andhra pradesh", "andhra", "vijayawada", "visakhapatnam", "hyderabad"],
@@ -175,7 +920,7 @@ INDIAN_LOCATIONS = {
 IDENTITY_KEYWORDS = [
     "pastor", "priest", "church", "christian", "believer", "worship", "ministry",
     "parish", "nun", "bishop", "prayer meeting", "believers", "missionary", "jesuit",
-    "apologetics", "apologist"
+    "apologetics", "apologist", "christianity", "worshippers", "worshipped", "parishioners"
 ]
 
 # Action/Persecution Keywords (Must indicate an incident)
@@ -185,7 +930,8 @@ PERSECUTION_KEYWORDS = [
     "police", "investigate", "court", "law", "conversion", "anti-conversion",
     "burned", "destroyed", "forced", "torture", "harassed", "beating",
     "demolish", "demolition", "threat", "assault", "raided", "stopped",
-    "interrupted", "disrupted", "forbidden", "discrimination"
+    "interrupted", "disrupted", "forbidden", "discrimination", "vandalism",
+    "vandalised", "policeman", "policemen"
 ]
 
 # Negative Keywords (Discard if these are present in a "general" context)
@@ -195,211 +941,994 @@ NEGATIVE_KEYWORDS = [
     "dry day", "tribute", "legacy", "historical", "festival"
 ]
 
-def init_supabase() -> Client:
-    return create_client(SUPABASE_URL, SUPABASE_KEY)
-def batch_summarize_incidents(incidents):
-    """Summarizes a batch of incidents using GeminiManager with fallback and rotation."""
-    if not gemini_manager or not incidents:
-        return [sanitize_text(inc['description'])[:500] + "..." for inc in incidents]
+# Regular endings a category keyword may take and still match ("attack" -> "attacked")
+KEYWORD_INFLECTIONS = r'(?:s|es|d|ed|ing|ers?)?'
 
-    batch_prompt = "Summarize the following Christian persecution incidents in India. For each incident, provide exactly 10 short, bulleted lines focusing on: What happened, Who was involved, Where, and Current status. Highlight important names or entities in bold.\n\n"
-    for i, inc in enumerate(incidents):
-        batch_prompt += f"--- INCIDENT {i+1} ---\nTITLE: {inc['title']}\nREPORT: {inc['description']}\n\n"
-        
-    batch_prompt += "\nReturn each summary separated by '===END_SUMMARY==='. Do not include the incident numbers or titles in your response, just the summaries."
+class KeywordClassifier:
+    """Single-pass keyword matcher for relevance filtering and location extraction.
+
+    All keyword lists are compiled into one trie-shaped regex, and every keyword
+    must match a whole word. Category keywords may also take one of the regular
+    endings in KEYWORD_INFLECTIONS ("attack" catches "attacks", "attacked",
+    "attackers"), but nothing else, so "mob" no longer fires on "mobile" or "law"
+    on "lawn"; other forms are listed as keywords of their own. Two-letter location
+    abbreviations ("UP", "MP") must be upper case in the original text, so they
+    do not fire on the English word "up".
+    """
+    def __init__(self, categories, locations):
+        self.location_order = list(locations)
+        self.labels = {}
+        inflected_terms, word_terms = set(), set()
+        for category, keywords in categories.items():
+            for kw in keywords:
+                self.labels.setdefault(kw, set()).add(("category", category))
+                inflected_terms.add(kw)
+        for state, keywords in locations.items():
+            for kw in keywords:
+                self.labels.setdefault(kw, set()).add(("location", state))
+                word_terms.add(kw)
+        self.abbreviations = {kw for kw in word_terms if len(kw) <= 2}
+
+        # Matching runs on lower-cased text; IGNORECASE makes the scan several times slower.
+        # A lookbehind instead of a leading \b keeps sre's fast first-character scan.
+        self.pattern = re.compile(r'(?<!\w)' + self._trie_pattern(inflected_terms, word_terms))
+
+    @staticmethod
+    def _trie_pattern(inflected_terms, word_terms):
+        """Builds one regex over all keywords with shared prefixes factored out.
+
+        Word terms must end on a word boundary; inflected terms may first take an
+        ending from KEYWORD_INFLECTIONS. Endings sit in a lookahead, so the match
+        itself is always the keyword and can be looked up in self.labels.
+        """
+        trie = {}
+        for term in word_terms:
+            node = trie
+            for ch in term:
+                node = node.setdefault(ch, {})
+            node.setdefault('', r'\b')
+        for term in inflected_terms:
+            node = trie
+            for ch in term:
+                node = node.setdefault(ch, {})
+            node[''] = f'(?={KEYWORD_INFLECTIONS}\\b)'
+
+        def emit(node):
+            end = node.get('')
+            branches = [(r'\s+' if ch == ' ' else re.escape(ch)) + emit(node[ch]) for ch in sorted(node) if ch]
+            if not branches:
+                return end
+            body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+            if end:
+                body = '(?:' + body + '|' + end + ')'
+            return body
+
+        return emit(trie)
+
+    def classify(self, text):
+        """Returns per-category and per-location hit counts from one scan of the text."""
+        result = {"categories": {}, "locations": {}}
+        text = text or ""
+        lowered = text.lower()
+        # Offsets only line up with the original text if lower() kept the length
+        same_offsets = len(lowered) == len(text)
+        for match in self.pattern.finditer(lowered):
+            keyword = match.group(0)
+            if ' ' in keyword or '\n' in keyword or '\t' in keyword:
+                keyword = ' '.join(keyword.split())
+            if keyword in self.abbreviations and not (same_offsets and text[match.start():match.end()].isupper()):
+                continue
+            for kind, label in self.labels.get(keyword, ()):
+                bucket = result["categories" if kind == "category" else "locations"]
+                bucket[label] = bucket.get(label, 0) + 1
+        return result
+
+    def best_location(self, result):
+        """The most mentioned state (ties go to INDIAN_LOCATIONS order), or "India"."""
+        locations = result["locations"]
+        if not locations:
+            return "India" # Fallback
+        return max(locations, key=lambda state: (locations[state], -self.location_order.index(state)))
+
+# Compiled once at import and shared by every entry in the run
+keyword_classifier = KeywordClassifier(
+    {
+        "india": ["india", "indian", "indians"],
+        "identity": IDENTITY_KEYWORDS,
+        "persecution": PERSECUTION_KEYWORDS,
+        "negative": NEGATIVE_KEYWORDS
+    },
+    INDIAN_LOCATIONS
+)
+
+def init_supabase(count_round_trips=False) -> "Client":
+    """Creates a Supabase client; only the ingest pipeline's client counts its requests in run_stats."""
+    from supabase import create_client
+    client = create_client(SUPABASE_URL, SUPABASE_KEY)
+    if count_round_trips:
+        # Every table/RPC call goes through the PostgREST httpx session; count them as DB round trips
+        client.postgrest.session.event_hooks["request"].append(lambda request: run_stats.incr("db_round_trips"))
+    return client
+SUMMARY_INSTRUCTIONS = (
+    "Summarize the following Christian persecution incidents in India. For each incident, provide exactly "
+    "10 short, bulleted lines focusing on: What happened, Who was involved, Where, and Current status. "
+    "Highlight important names or entities in bold.\n\n"
+)
+
+def estimate_tokens(text):
+    """Rough token count (~4 chars per token), good enough for budgeting."""
+    return len(text) // 4 + 1
+
+def incident_prompt(incident_id, incident):
+    return f"--- INCIDENT {incident_id} ---\nTITLE: {incident['title']}\nREPORT: {incident['description']}\n\n"
+
+def fallback_summary(incident):
+    return sanitize_text(incident['description'])[:500] + "..."
+
+def summary_batch_budget():
+    """Prompt tokens one request may carry: the smallest budget of any model it can fall back to."""
+    models = gemini_manager.models if gemini_manager else []
+    return min((GEMINI_MODEL_LIMITS.get(m, GEMINI_DEFAULT_LIMITS)["batch_tokens"] for m in models),
+               default=GEMINI_DEFAULT_LIMITS["batch_tokens"])
+
+def pack_batches(items, costs, budget, max_items=SUMMARY_MAX_ITEMS):
+    """Greedily packs items, in order, into batches whose summed cost stays within budget.
+
+    An item costing more than the whole budget still gets a batch of its own.
+    """
+    batches, current, used = [], [], 0
+    for item, cost in zip(items, costs):
+        if current and (used + cost > budget or len(current) >= max_items):
+            batches.append(current)
+            current, used = [], 0
+        current.append(item)
+        used += cost
+    if current:
+        batches.append(current)
+    return batches
+
+def parse_summaries(text, ids):
+    """Maps incident ID -> summary from the model's JSON, keeping only valid entries for requested IDs."""
+    try:
+        data = json.loads(text)
+    except (TypeError, ValueError):
+        return {}
+    if isinstance(data, dict):
+        data = data.get("summaries", [])
+    summaries = {}
+    for item in data if isinstance(data, list) else []:
+        if not isinstance(item, dict):
+            continue
+        incident_id, summary = str(item.get("id", "")).strip(), item.get("summary")
+        if incident_id in ids and isinstance(summary, str) and len(summary.strip()) > SUMMARY_MIN_CHARS:
+            summaries.setdefault(incident_id, summary.strip())
+    return summaries
+
+def request_summaries(incidents):
+    """Summarizes one packed batch in a single Gemini call.
+
+    Returns {index: summary} for the incidents the model answered validly; any
+    missing, malformed or misattributed entry is simply absent.
+    """
+    ids = [str(i + 1) for i in range(len(incidents))]
+    prompt = SUMMARY_INSTRUCTIONS + ''.join(incident_prompt(i, inc) for i, inc in zip(ids, incidents))
+    prompt += ("Return a JSON array with one object per incident: {\"id\": the incident number, "
+               "\"summary\": its bulleted lines as one string}. Do not repeat the titles in the summaries.")
 
     def do_summarize(client, model_name, prompt):
         print(f"--- PRE-AI BATCH PROMPT ({len(incidents)} items, model: {model_name}) ---")
-        # print(prompt) # Truncated for cleaner logs
-        print("-" * 50)
-        
-        # RPM Throttle: Ensure at least 4 seconds between calls (approx 15 RPM)
-        # We'll use a globally shared timestamp if needed, but for now simple sleep
-        time.sleep(random.uniform(2, 5)) 
-
         response = client.models.generate_content(
             model=model_name,
-            contents=prompt
+            contents=prompt,
+            config={"response_mime_type": "application/json", "response_schema": SUMMARY_SCHEMA}
         )
-        
         print(f"--- POST-AI BATCH RESPONSE ({model_name}) ---")
-        # print(response.text)
-        print("-" * 50)
-        
-        summaries = response.text.split("===END_SUMMARY===")
-        summaries = [s.strip() for s in summaries if len(s.strip()) > 20]
-        return summaries
+        usage = getattr(response, "usage_metadata", None)
+        if usage and getattr(usage, "total_token_count", None):
+            run_stats.incr("gemini_tokens", usage.total_token_count)
+        return parse_summaries(response.text, set(ids))
 
     try:
-        summaries = gemini_manager.call_with_fallback(do_summarize, batch_prompt)
-        
-        while len(summaries) < len(incidents):
-            summaries.append("Summary unavailable due to processing error.")
-            
-        return summaries[:len(incidents)]
-
+        est_tokens = estimate_tokens(prompt) + SUMMARY_OUTPUT_TOKENS * len(incidents)
+        summaries = gemini_manager.call_with_fallback(do_summarize, prompt, est_tokens=est_tokens)
     except Exception as e:
         print(f"Batch Gemini Strategy Failed: {e}")
-        return [sanitize_text(inc['description'])[:500] + "..." for inc in incidents]
+        return {}
+    return {int(incident_id) - 1: summary for incident_id, summary in summaries.items()}
+
+def summarize_batch(incidents):
+    """Summarizes one already-packed batch, returning {index: summary} for those Gemini answered.
+
+    Items the model leaves out or answers invalidly are requested again, up to
+    SUMMARY_MAX_ATTEMPTS requests each. Runs on the caller's thread.
+    """
+    summaries = {}
+    if not gemini_manager or not incidents:
+        return summaries
+
+    pending = list(range(len(incidents)))
+    for attempt in range(1, SUMMARY_MAX_ATTEMPTS + 1):
+        result = request_summaries([incidents[i] for i in pending])
+        for position, summary in result.items():
+            summaries[pending[position]] = summary
+        pending = [i for i in pending if i not in summaries]
+        if not pending:
+            break
+        print(f"{len(pending)} summaries missing or invalid; re-queueing them.")
+        run_stats.incr("summaries_requeued", len(pending))
+    return summaries
+
+def gemini_summaries(incidents):
+    """Summarizes incidents in token-budgeted batches, returning {index: summary} for those Gemini answered.
+
+    Items the model leaves out or answers invalidly are re-queued on their own,
+    up to SUMMARY_MAX_ATTEMPTS requests each.
+    """
+    summaries = {}
+    if not gemini_manager or not incidents:
+        return summaries
+
+    pending = list(range(len(incidents)))
+    budget = summary_batch_budget() - estimate_tokens(SUMMARY_INSTRUCTIONS)
+    workers = max(1, len(GEMINI_API_KEYS)) * GEMINI_WORKERS_PER_KEY
+    for attempt in range(1, SUMMARY_MAX_ATTEMPTS + 1):
+        costs = [estimate_tokens(incident_prompt(i + 1, incidents[i])) for i in pending]
+        batches = pack_batches(pending, costs, budget)
+        print(f"Summarizing {len(pending)} incidents in {len(batches)} requests (attempt {attempt})...")
+        # Batches run in parallel; GeminiScheduler keeps each key/model within its quota
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = pool.map(lambda batch: request_summaries([incidents[i] for i in batch]), batches)
+            for batch, result in zip(batches, results):
+                for position, summary in result.items():
+                    summaries[batch[position]] = summary
+        pending = [i for i in pending if i not in summaries]
+        if not pending:
+            break
+        print(f"{len(pending)} summaries missing or invalid; re-queueing them.")
+        run_stats.incr("summaries_requeued", len(pending))
+    return summaries
+
+def batch_summarize_incidents(incidents):
+    """Returns one summary per incident, in order, falling back to the sanitized description."""
+    summaries = gemini_summaries(incidents)
+    return [summaries.get(i) or fallback_summary(inc) for i, inc in enumerate(incidents)]
+
+class RedirectCache(JsonCache):
+    """Persistent short URL -> final URL map, with short-lived entries for failed lookups."""
+    max_age = REDIRECT_CACHE_TTL_DAYS * 86400
+
+    def __init__(self, name="redirects.json"):
+        super().__init__(name)
+
+    def get(self, url):
+        """Returns (found, final_url); final_url is None for a cached failure."""
+        with self._lock:
+            entry = self._load().get(url)
+            ttl = self.max_age if entry and entry["final"] else REDIRECT_FAILURE_TTL_HOURS * 3600
+            if not entry or time.time() - entry["at"] > ttl:
+                self.misses += 1
+                return False, None
+            self.hits += 1
+            return True, entry["final"]
+
+    def put(self, url, final_url):
+        with self._lock:
+            self._load()[url] = {"final": final_url, "at": time.time()}
+
+# Shared redirect cache for the whole run
+redirect_cache = RedirectCache()
+
+def content_hash(incident):
+    """Hash of an incident's normalized title and report, stored as incidents.similarity_hash.
+
+    Markup, case, punctuation and whitespace are ignored so re-syndicated copies of a report hash alike.
+    """
+    text = f"{sanitize_text(incident['title'])} {sanitize_text(incident['description'])}".lower()
+    normalized = ' '.join(re.findall(r'\w+', text))
+    return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+
+class SummaryCache(JsonCache):
+    """Gemini summaries keyed by content hash, kept locally and looked up in incidents.
+
+    The local file survives a failed insert or a retried run; the DB lookup covers
+    reports already ingested by earlier runs. Fallback summaries are never cached.
+    """
+    max_age = SUMMARY_CACHE_TTL_DAYS * 86400
+
+    def __init__(self, name="summaries.json"):
+        super().__init__(name)
+
+    def prefetch(self, supabase, by_hash):
+        """Pulls summaries of already-stored incidents with the same hashes (a {hash: incident} map), a chunk per query."""
+        with self._lock:
+            entries = self._load()
+            missing = [h for h in by_hash if h not in entries]
+        for i in range(0, len(missing), SUMMARY_CACHE_QUERY_CHUNK):
+            chunk = missing[i:i + SUMMARY_CACHE_QUERY_CHUNK]
+            try:
+                res = supabase.table("incidents").select("similarity_hash, summary").in_("similarity_hash", chunk).execute()
+            except Exception as e:
+                print(f"Error loading cached summaries: {e}")
+                return
+            for row in res.data:
+                summary, content = row.get('summary'), row['similarity_hash']
+                if summary and summary != fallback_summary(by_hash[content]):
+                    self.put(content, summary)
+
+    def get(self, content):
+        with self._lock:
+            entry = self._load().get(content)
+            if entry and time.time() - entry["at"] <= self.max_age:
+                self.hits += 1
+                return entry["summary"]
+            self.misses += 1
+            return None
+
+    def put(self, content, summary):
+        with self._lock:
+            self._load()[content] = {"summary": summary, "at": time.time()}
+
+# Shared summary cache for the whole run
+summary_cache = SummaryCache()
+
+class MirrorPool(JsonStateFile):
+    """Interchangeable mirrors ranked by recent success rate and latency, saved between runs.
+
+    fetch() tries the best-ranked mirror first and hedges: the next one is fired
+    after hedge_delay, or as soon as a request fails, and the first success wins.
+    """
+    _executor = None
+    _executor_lock = threading.Lock()
+
+    def __init__(self, name, mirrors, hedge_delay=MIRROR_HEDGE_DELAY):
+        super().__init__(f"mirrors_{name}.json")
+        self.name = name
+        self.mirrors = mirrors
+        self.hedge_delay = hedge_delay
+
+    @classmethod
+    def executor(cls):
+        with cls._executor_lock:
+            if cls._executor is None:
+                cls._executor = ThreadPoolExecutor(max_workers=MIRROR_WORKERS)
+            return cls._executor
+
+    def _entry(self, mirror):
+        return self._load().setdefault(mirror, {"success_rate": 1.0, "latency": None})
+
+    def ranked(self):
+        """Mirrors by success rate, then latency; untried mirrors count as hedge_delay and near-ties keep list order."""
+        with self._lock:
+            def score(mirror):
+                entry = self._entry(mirror)
+                latency = entry["latency"] if entry["latency"] is not None else self.hedge_delay
+                return (-round(entry["success_rate"], 1), round(latency, 1))
+            return sorted(self.mirrors, key=score)
+
+    def record(self, mirror, ok, latency):
+        with self._lock:
+            entry = self._entry(mirror)
+            entry["success_rate"] += MIRROR_HEALTH_DECAY * ((1.0 if ok else 0.0) - entry["success_rate"])
+            if ok:
+                previous = entry["latency"]
+                entry["latency"] = latency if previous is None else previous + MIRROR_HEALTH_DECAY * (latency - previous)
+
+    def _timed(self, mirror, attempt, url):
+        started = time.monotonic()
+        try:
+            result = attempt(url)
+        except Exception:
+            self.record(mirror, False, time.monotonic() - started)
+            raise
+        self.record(mirror, True, time.monotonic() - started)
+        return result
+
+    def fetch(self, build_url, attempt):
+        """Returns (url, attempt(url)) from the first mirror to succeed; attempt raises to report failure."""
+        ranked = self.ranked()
+        pending = {}
+        errors = []
+        while True:
+            if len(pending) + len(errors) < len(ranked):
+                mirror = ranked[len(pending) + len(errors)]
+                pending[self.executor().submit(self._timed, mirror, attempt, build_url(mirror))] = mirror
+            if not pending:
+                raise Exception("; ".join(errors) or "no mirrors configured")
+            # Hedge after hedge_delay while untried mirrors remain; otherwise wait for the stragglers
+            more = len(pending) + len(errors) < len(ranked)
+            done, _ = wait(pending, timeout=self.hedge_delay if more else None, return_when=FIRST_COMPLETED)
+            for future in done:
+                mirror = pending.pop(future)
+                try:
+                    return build_url(mirror), future.result()
+                except Exception as e:
+                    errors.append(f"{mirror}: {e}")
+
+    def _snapshot(self, entries):
+        # Mirrors dropped from the configured list are forgotten
+        return {m: e for m, e in entries.items() if m in self.mirrors}
+
+    def stats(self):
+        ranked = self.ranked()
+        with self._lock:
+            return {m: round(self._entry(m)["success_rate"], 2) for m in ranked}
+
+# Shared mirror pools for social sentinels
+nitter_pool = MirrorPool("nitter", NITTER_MIRRORS)
+rss_bridge_pool = MirrorPool("rss_bridge", RSS_BRIDGE_INSTANCES)
+
+def summarize_with_cache(incidents, supabase=None):
+    """Returns (similarity_hash, summary) for each incident, calling Gemini once per uncached content hash.
+
+    The incidents come already packed to one request's token budget, so the
+    uncached ones go to Gemini as a single batch. They are left untouched, so
+    this can run on a worker thread while the pipeline still groups reports into them.
+    """
+    hashes = [content_hash(inc) for inc in incidents]
+    if supabase:
+        summary_cache.prefetch(supabase, dict(zip(hashes, incidents)))
+
+    # Identical or re-syndicated reports are looked up, and summarized, once
+    summaries, uncached = {}, []
+    for inc, content in zip(incidents, hashes):
+        if content not in summaries:
+            summaries[content] = summary_cache.get(content)
+            if summaries[content] is None:
+                uncached.append((inc, content))
+    print(f"Summary cache: {len(incidents) - len(uncached)} of {len(incidents)} incidents need no new summary.")
+
+    for index, summary in summarize_batch([inc for inc, _ in uncached]).items():
+        content = uncached[index][1]
+        summaries[content] = summary
+        summary_cache.put(content, summary)
+
+    return [(content, summaries[content] or fallback_summary(inc)) for inc, content in zip(incidents, hashes)]
+
+META_TAG = re.compile(r'<meta\b[^>]*>', re.IGNORECASE)
+META_REFRESH_URL = re.compile(r'content\s*=\s*["\']?[^"\'>]*?url\s*=\s*([^"\'>\s]+)', re.IGNORECASE)
+
+def _follow_redirects(url):
+    """Finds the final URL without downloading full pages."""
+    # HEAD is enough for HTTP redirects (bit.ly, t.co, tinyurl)
+    try:
+        response = http_client.head(url, timeout=10, allow_redirects=True)
+        if response.url != url and response.status_code < 400:
+            return response.url
+    except requests.RequestException:
+        pass # Some redirectors reject HEAD; fall through to GET
+
+    # Stream the page and stop once the redirect or a meta refresh is known
+    response = http_client.get(url, timeout=10, allow_redirects=True, stream=True)
+    try:
+        if response.url != url:
+            return response.url
+        # Specific logic for Google News meta refresh
+        if "google.com" in response.url:
+            head = b""
+            for chunk in response.iter_content(chunk_size=8192):
+                head += chunk
+                if b"</head>" in head.lower() or len(head) >= REDIRECT_SNIFF_BYTES:
+                    break
+            http_client.record_bytes(len(head))
+            for tag in META_TAG.findall(head.decode("utf-8", errors="replace")):
+                if "refresh" in tag.lower():
+                    match = META_REFRESH_URL.search(tag)
+                    if match:
+                        print(f"Meta refresh resolved to: {match.group(1)}")
+                        return match.group(1)
+    finally:
+        response.close()
+    return url
 
 def resolve_url(url):
     """Follows redirects to get the direct article link, especially for Google News and shorteners."""
     if not url or url == "#": return url
     
     # Check if it's a known redirector/shortener
-    redirectors = ["news.google.com", "t.co", "bit.ly", "tinyurl.com"]
-    if not any(r in url for r in redirectors):
+    if not any(r in url for r in REDIRECTORS):
         return url
+
+    found, final_url = redirect_cache.get(url)
+    if found:
+        return final_url or url
         
     print(f"Resolving redirect: {url}")
     try:
-        # Use a fresh session to follow redirects
-        session = requests.Session()
-        response = session.get(url, headers=DEFAULT_HEADERS, timeout=10, allow_redirects=True)
-        final_url = response.url
+        final_url = _follow_redirects(url)
         if final_url != url:
             print(f"Resolved to: {final_url}")
-            return final_url
-            
-        # Specific logic for Google News meta refresh
-        if "google.com" in final_url:
-            soup = BeautifulSoup(response.text, "html.parser")
-            meta_refresh = soup.find("meta", attrs={"http-equiv": "refresh"})
-            if meta_refresh and "url=" in meta_refresh.get("content", "").lower():
-                new_url = meta_refresh["content"].lower().split("url=")[1].strip()
-                print(f"Meta refresh resolved to: {new_url}")
-                return new_url
+        redirect_cache.put(url, final_url)
+        return final_url
     except Exception as e:
         print(f"Error resolving redirect: {e}")
+        redirect_cache.put(url, None)
         
     return url
 
+class ArticleCache:
+    """On-disk cache of scraped article bodies, keyed by resolved URL.
+
+    Bodies are zlib-compressed in a SQLite file with their extraction path
+    ('direct' or 'jina'). Entries expire after the TTL and the least recently
+    used ones are evicted once the cache grows past max_bytes.
+    """
+    def __init__(self, path, ttl_days=ARTICLE_CACHE_TTL_DAYS, max_mb=ARTICLE_CACHE_MAX_MB):
+        self.path = path
+        self.ttl = ttl_days * 86400
+        self.max_bytes = max_mb * 1024 * 1024
+        self._lock = threading.Lock()
+        self._conn = None
+        self._disabled = False
+        self.hits = 0
+        self.misses = 0
+
+    def _connect(self):
+        if self._conn is None and not self._disabled:
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+                self._conn.execute("""
+                    CREATE TABLE IF NOT EXISTS articles (
+                        url TEXT PRIMARY KEY,
+                        body BLOB NOT NULL,
+                        size INTEGER NOT NULL,
+                        method TEXT NOT NULL,
+                        fetched_at REAL NOT NULL,
+                        accessed_at REAL NOT NULL
+                    )""")
+                self._conn.execute("CREATE INDEX IF NOT EXISTS idx_articles_accessed ON articles(accessed_at)")
+                self._conn.commit()
+            except Exception as e:
+                print(f"Article cache disabled ({self.path}): {e}")
+                self._disabled = True
+        return self._conn
+
+    def get(self, url):
+        """Returns (text, method) for a fresh cached body, or None."""
+        with self._lock:
+            conn = self._connect()
+            row = None
+            if conn:
+                row = conn.execute("SELECT body, method, fetched_at FROM articles WHERE url = ?", (url,)).fetchone()
+            if not row or time.time() - row[2] > self.ttl:
+                self.misses += 1
+                return None
+            conn.execute("UPDATE articles SET accessed_at = ? WHERE url = ?", (time.time(), url))
+            conn.commit()
+            self.hits += 1
+            return zlib.decompress(row[0]).decode('utf-8'), row[1]
+
+    def put(self, url, text, method):
+        with self._lock:
+            conn = self._connect()
+            if not conn or not text:
+                return
+            body = zlib.compress(text.encode('utf-8'))
+            now = time.time()
+            conn.execute(
+                "INSERT OR REPLACE INTO articles (url, body, size, method, fetched_at, accessed_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (url, body, len(body), method, now, now)
+            )
+            conn.commit()
+
+    def evict(self):
+        """Drops expired bodies, then least recently used ones until under the size cap."""
+        with self._lock:
+            conn = self._connect()
+            if not conn:
+                return
+            conn.execute("DELETE FROM articles WHERE fetched_at < ?", (time.time() - self.ttl,))
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM articles").fetchone()[0]
+            if total > self.max_bytes:
+                excess = total - self.max_bytes
+                for url, size in conn.execute("SELECT url, size FROM articles ORDER BY accessed_at").fetchall():
+                    if excess <= 0:
+                        break
+                    conn.execute("DELETE FROM articles WHERE url = ?", (url,))
+                    excess -= size
+            conn.commit()
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses}
+
+# Shared article cache for the whole run
+article_cache = ArticleCache(os.path.join(CACHE_DIR, "articles.sqlite3"))
+
+HTML_CHARSET = re.compile(rb'<meta[^>]+charset=["\']?([a-zA-Z0-9_-]+)', re.IGNORECASE)
+XML_DECLARATION = re.compile(r'^\s*<\?xml[^>]*\?>')
+
+def read_capped(response, max_bytes=ARTICLE_MAX_BYTES):
+    """Reads a streamed response body, stopping once max_bytes have arrived."""
+    chunks, total = [], 0
+    try:
+        for chunk in response.iter_content(chunk_size=16384):
+            chunks.append(chunk)
+            total += len(chunk)
+            if total >= max_bytes:
+                break
+    finally:
+        response.close()
+    http_client.record_bytes(total)
+    return b"".join(chunks)[:max_bytes]
+
+def decode_html(raw, content_type=""):
+    """Decodes page bytes using the header charset, then the <meta> charset, then UTF-8."""
+    charset = None
+    if "charset=" in (content_type or "").lower():
+        charset = content_type.lower().split("charset=")[-1].split(";")[0].strip(' "\'')
+    if not charset:
+        match = HTML_CHARSET.search(raw[:4096])
+        charset = match.group(1).decode("ascii") if match else "utf-8"
+    try:
+        return raw.decode(charset, errors="replace")
+    except LookupError:
+        return raw.decode("utf-8", errors="replace")
+
+def _class_xpath(selector):
+    tag, _, css_class = selector.partition('.')
+    if not css_class:
+        return f"//{tag}"
+    return f"//{tag}[contains(concat(' ', normalize-space(@class), ' '), ' {css_class} ')]"
+
+CONTENT_XPATHS = [_class_xpath(selector) for selector in CONTENT_SELECTORS]
+
+def _join_until(parts, separator, max_chars):
+    """Joins text parts, stopping as soon as max_chars have been collected."""
+    collected, length = [], 0
+    for part in parts:
+        collected.append(part)
+        length += len(part) + len(separator)
+        if length > max_chars:
+            break
+    return separator.join(collected)[:max_chars]
+
+def _extract_with_lxml(html, max_chars):
+    import lxml.html
+    doc = lxml.html.document_fromstring(XML_DECLARATION.sub('', html, count=1))
+    # Remove noisy elements
+    for element in doc.xpath('|'.join(f"//{tag}" for tag in NOISE_TAGS)):
+        element.drop_tree()
+
+    for xpath in CONTENT_XPATHS:
+        targets = doc.xpath(f"({xpath})[1]")
+        if targets:
+            text = _join_until((t.strip() for t in targets[0].itertext() if t.strip()), ' ', max_chars)
+            if text:
+                return text
+
+    # Fallback: Just take all paragraphs
+    def paragraphs():
+        for p in doc.iter('p'):
+            parts = list(p.itertext())
+            if len(''.join(parts)) > 20:
+                yield ''.join(t.strip() for t in parts)
+    return _join_until(paragraphs(), ' ', max_chars)
+
+def _extract_with_soup(html, max_chars):
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(html, "html.parser")
+    
+    # Remove noisy elements
+    for script in soup(NOISE_TAGS):
+        script.decompose()
+    
+    main_content = ""
+    for selector in CONTENT_SELECTORS:
+        target = soup.select_one(selector)
+        if target:
+            main_content = target.get_text(separator=' ', strip=True)
+            break
+    
+    if not main_content:
+        # Fallback: Just take all paragraphs
+        paragraphs = soup.find_all('p')
+        main_content = ' '.join([p.get_text(strip=True) for p in paragraphs if len(p.get_text()) > 20])
+    return main_content[:max_chars]
+
+def extract_article_text(html, max_chars=ARTICLE_MAX_CHARS):
+    """Extracts the main article text from a page, using lxml when it is installed."""
+    if HAS_LXML:
+        try:
+            return _extract_with_lxml(html, max_chars)
+        except Exception as e:
+            print(f"lxml extraction failed ({e}), retrying with html.parser")
+    return _extract_with_soup(html, max_chars)
+
 def deep_scrape_article(url):
-    """Fetches the full article body from a given URL."""
+    """Fetches the full article body from a given URL, or "" if it cannot be fetched."""
+    try:
+        return fetch_article(url)
+    except Exception as e:
+        print(f"Deep Scrape Error ({url}): {e}")
+        return ""
+
+def fetch_article(url):
+    """Fetches the full article body, raising if the page (or its redirect) could not be fetched."""
     if not url or url == "#": return ""
     
     # Resolve redirects first (especially for Google News)
-    url = resolve_url(url)
+    short_url, url = url, resolve_url(url)
+    if url == short_url and any(r in url for r in REDIRECTORS):
+        raise Exception("redirect could not be resolved")
+
+    # Re-runs and retries reuse bodies scraped earlier
+    cached = article_cache.get(url)
+    if cached:
+        text, method = cached
+        print(f"Article cache hit ({method}): {url}")
+        return text
     
     print(f"Deep scraping: {url}")
-    try:
-        # Use full headers to avoid 403s
-        response = requests.get(url, timeout=15, headers=DEFAULT_HEADERS)
-        
-        # If blocked (403/401), try Jina Reader as a bypass
-        if response.status_code in [403, 401]:
-            print(f"Direct access blocked ({response.status_code}). Trying Jina Reader...")
-            jina_url = f"https://r.jina.ai/{url}"
-            jina_resp = requests.get(jina_url, timeout=20)
-            if jina_resp.status_code == 200:
-                print("Jina Reader success!")
-                return jina_resp.text[:5000]
-                
-        response.raise_for_status()
-        soup = BeautifulSoup(response.text, "html.parser")
-        
-        # Remove noisy elements
-        for script in soup(["script", "style", "nav", "footer", "header", "aside"]):
-            script.decompose()
+    # Use full headers to avoid 403s; stream so huge pages are cut off at ARTICLE_MAX_BYTES
+    response = http_client.get(url, timeout=15, stream=True)
+    
+    # If blocked (403/401), try Jina Reader as a bypass
+    if response.status_code in [403, 401]:
+        response.close()
+        print(f"Direct access blocked ({response.status_code}). Trying Jina Reader...")
+        jina_url = f"https://r.jina.ai/{url}"
+        jina_resp = http_client.get(jina_url, timeout=20, stream=True)
+        if jina_resp.status_code == 200:
+            print("Jina Reader success!")
+            # Reader output is plain text/markdown; UTF-8 needs at most 4 bytes per char
+            raw = read_capped(jina_resp, ARTICLE_MAX_CHARS * 4)
+            text = raw.decode("utf-8", errors="replace")[:ARTICLE_MAX_CHARS]
+            article_cache.put(url, text, "jina")
+            return text
+        jina_resp.close()
             
-        # Try to find the main content block (common news tags)
-        content_selectors = [
-            'div.entry-content', 'div.article-body', 'div.story-content', 
-            'article', 'main', 'div.post-content'
-        ]
-        
-        main_content = ""
-        for selector in content_selectors:
-            target = soup.select_one(selector)
-            if target:
-                main_content = target.get_text(separator=' ', strip=True)
+    if response.status_code >= 400:
+        response.close()
+    response.raise_for_status()
+    html = decode_html(read_capped(response), response.headers.get("Content-Type", ""))
+    main_content = extract_article_text(html)
+    article_cache.put(url, main_content, "direct")
+    return main_content
+
+class TextExtractor(HTMLParser):
+    """Collects the text BeautifulSoup(text, "html.parser").get_text() returns, without building a tree.
+
+    Uses the same stdlib tokenizer and entity tables as bs4, so output matches
+    it exactly while skipping the per-node object allocation.
+    """
+    # bs4's tag and entity tables, loaded by the first extract()
+    HIDDEN_TAGS = VOID_TAGS = ENTITIES = CHARACTER_REFERENCE = None
+    # Set when this bs4 lacks one of those tables; extract() then uses bs4 itself
+    use_bs4 = False
+    DECIMAL_REFERENCE = re.compile("^([0-9]+)(.*)")
+    HEX_REFERENCE = re.compile("^([0-9a-f]+)(.*)")
+
+    def __init__(self):
+        super().__init__(convert_charrefs=False)
+        self.parts = []
+        self.open_tags = []
+        self.hidden_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.VOID_TAGS:
+            return
+        self.open_tags.append(tag)
+        if tag in self.HIDDEN_TAGS:
+            self.hidden_depth += 1
+
+    def handle_startendtag(self, tag, attrs):
+        pass # <tag/> opens and closes immediately
+
+    def handle_endtag(self, tag):
+        # Like bs4, close everything up to the most recent matching tag, or ignore a stray end tag
+        if tag not in self.open_tags:
+            return
+        while self.open_tags:
+            closed = self.open_tags.pop()
+            if closed in self.HIDDEN_TAGS:
+                self.hidden_depth -= 1
+            if closed == tag:
                 break
-        
-        if not main_content:
-            # Fallback: Just take all paragraphs
-            paragraphs = soup.find_all('p')
-            main_content = ' '.join([p.get_text(strip=True) for p in paragraphs if len(p.get_text()) > 20])
-            
-        return main_content[:5000] # Limit to 5k chars for prompt efficiency
-    except Exception as e:
-        print(f"Deep Scrape Error ({url}): {e}")
-        return ""
+
+    def handle_data(self, data):
+        if not self.hidden_depth:
+            self.parts.append(data)
+
+    def handle_entityref(self, name):
+        # Unknown entities stay literal ("&foo"), as in bs4
+        self.handle_data(self.ENTITIES.get(name, f"&{name}"))
+
+    def handle_charref(self, name):
+        pattern, base = self.DECIMAL_REFERENCE, 10
+        if name[:1] in ("x", "X"):
+            name, pattern, base = name[1:], self.HEX_REFERENCE, 16
+        extra = ""
+        try:
+            code = int(name, base)
+        except ValueError:
+            match = pattern.search(name)
+            if not match:
+                self.handle_data(name)
+                return
+            code, extra = int(match.group(1), base), match.group(2)
+        self.handle_data(self.CHARACTER_REFERENCE(code)[0])
+        if extra:
+            self.handle_data(extra)
+
+    def unknown_decl(self, data):
+        # bs4 keeps CDATA text even inside hidden containers
+        if data.upper().startswith("CDATA["):
+            self.parts.append(data[len("CDATA["):])
+
+    # Comments, doctypes and processing instructions carry no text
+    def handle_comment(self, data): pass
+    def handle_decl(self, decl): pass
+    def handle_pi(self, data): pass
+
+    @classmethod
+    def load_tables(cls):
+        from bs4.builder import HTMLParserTreeBuilder
+        from bs4.dammit import EntitySubstitution, UnicodeDammit
+        # Strings nested in these tags are excluded from get_text() by bs4.
+        # Read everything before assigning, so a missing table leaves none of them half-set.
+        tables = (
+            set(HTMLParserTreeBuilder.DEFAULT_STRING_CONTAINERS),
+            HTMLParserTreeBuilder.DEFAULT_EMPTY_ELEMENT_TAGS,
+            EntitySubstitution.HTML_ENTITY_TO_CHARACTER,
+            UnicodeDammit.numeric_character_reference,
+        )
+        cls.HIDDEN_TAGS, cls.VOID_TAGS, cls.ENTITIES, cls.CHARACTER_REFERENCE = tables
+
+    @classmethod
+    def extract(cls, text):
+        if cls.HIDDEN_TAGS is None and not cls.use_bs4:
+            try:
+                cls.load_tables()
+            except (ImportError, AttributeError) as e:
+                print(f"bs4 tables unavailable ({e}); extracting text with BeautifulSoup")
+                cls.use_bs4 = True
+        if cls.use_bs4:
+            from bs4 import BeautifulSoup
+            return BeautifulSoup(text, "html.parser").get_text()
+        parser = cls()
+        parser.feed(text)
+        parser.close()
+        return ''.join(parser.parts)
 
 def sanitize_text(text):
     """Removes HTML tags and extra whitespace."""
     if not text: return ""
-    # Strip HTML tags
-    clean = BeautifulSoup(text, "html.parser").get_text()
-    # Remove extra whitespace
-    clean = re.sub(r'\s+', ' ', clean).strip()
-    return clean
+    # Plain text (the common case for feed summaries) needs no parsing at all
+    if '<' in text or '&' in text:
+        # Strip HTML tags and decode entities
+        text = TextExtractor.extract(text)
+    # Remove extra whitespace (str.split uses the same whitespace set as regex \s)
+    return ' '.join(text.split())
 
 def extract_location(title, description):
     """Attempts to find a specific Indian state or city in the text."""
-    full_text = f"{title} {description}".lower()
-    
-    # Priority search for states and their respective cities
-    for state, keywords in INDIAN_LOCATIONS.items():
-        if any(kw in full_text for kw in keywords):
-            return state
-            
-    return "India" # Fallback
+    result = keyword_classifier.classify(f"{title} {description}")
+    return keyword_classifier.best_location(result)
+
+def fetch_rss_feed(feed_info):
+    """Fetches a single RSS source and returns its normalized entries."""
+    print(f"Fetching RSS: {feed_info['name']}")
+    try:
+        response = http_client.get(feed_info['url_or_handle'], timeout=15, headers=feed_cache.request_headers(feed_info))
+        if feed_cache.is_unchanged(feed_info, response):
+            print(f"RSS unchanged since last run, skipping: {feed_info['name']}")
+            return []
+        response.raise_for_status()
+        import feedparser
+        feed = feedparser.parse(response.text)
+    except Exception as e:
+        print(f"Error fetching RSS {feed_info['name']}: {e}")
+        return []
+
+    entries = []
+    for entry in feed.entries:
+        # Try to find image URL in RSS extensions
+        image_url = None
+        # Common RSS image tags
+        if hasattr(entry, 'media_content'):
+            image_url = entry.media_content[0].get('url')
+        elif hasattr(entry, 'links'):
+            for l in entry.links:
+                if l.get('rel') == 'enclosure' and 'image' in l.get('type', ''):
+                    image_url = l.get('href')
+
+        # Try to find the fullest description possible
+        content = entry.get("summary", entry.get("description", ""))
+        if hasattr(entry, 'content') and entry.content:
+            # content is usually a list of dicts with 'value' and 'type'
+            full_content = entry.content[0].get('value', '')
+            if len(full_content) > len(content):
+                content = full_content
+
+        entries.append({
+            "title": entry.title,
+            "link": entry.link,
+            "description": content,
+            "published": entry.get("published", entry.get("updated", datetime.now().isoformat())),
+            "source_name": feed_info['name'],
+            "source_id": feed_info.get('id'),
+            "image_url": image_url
+        })
+    return entries
+
+def fetch_social_source(source):
+    """Fetches a single social sentinel (X/FB) via RSS-Bridge, RSSHub, or Nitter mirrors."""
+    raw_val = source['url_or_handle']
+    name = source['name']
+
+    # Determine candidate RSS URLs
+    pool = None
+    if raw_val.startswith('http'):
+        # Direct RSS link provided (e.g. RSS-Bridge or RSSHub); RSS-Bridge links can go to any instance
+        bridge = next((b for b in RSS_BRIDGE_INSTANCES if raw_val.startswith(b + '/')), None)
+        if bridge:
+            pool, build_url = rss_bridge_pool, lambda instance: instance + raw_val[len(bridge):]
+    else:
+        # Handle provided, try Nitter mirrors for X
+        pool, build_url = nitter_pool, lambda mirror: f"{mirror}/{raw_val}/rss"
+
+    def attempt(rss_url):
+        print(f"Trying social feed: {rss_url}")
+        # Use a small timeout to skip slow mirrors quickly
+        response = http_client.get(rss_url, timeout=MIRROR_TIMEOUT, headers=feed_cache.request_headers(source))
+        if response.status_code == 304:
+            return response, None
+        if response.status_code != 200:
+            raise Exception(f"HTTP {response.status_code}")
+        import feedparser
+        feed = feedparser.parse(response.text)
+        if not feed.entries:
+            raise Exception("no entries")
+        return response, feed
+
+    try:
+        if pool:
+            rss_url, (response, feed) = pool.fetch(build_url, attempt)
+        else:
+            rss_url = raw_val
+            response, feed = attempt(rss_url)
+    except Exception as e:
+        print(f"Warning: Could not fetch {name} from any mirror/URL ({e}).")
+        return []
+
+    # Only the winning response is checked, so losing hedges cannot clobber the stored validators
+    if feed_cache.is_unchanged(source, response):
+        print(f"Social feed unchanged since last run, skipping: {name}")
+        return []
+    print(f"Successfully fetched {len(feed.entries)} posts from {name} via {rss_url}")
+    from bs4 import BeautifulSoup
+    entries = []
+    for entry in feed.entries:
+        # Try to find image in entry (Nitter/RSS-Bridge often put it in the description as an <img> tag)
+        image_url = None
+        summary_text = entry.get("summary", entry.get("description", ""))
+        if summary_text:
+            soup = BeautifulSoup(summary_text, 'html.parser')
+            img = soup.find('img')
+            if img:
+                image_url = img.get('src')
+                # Handle relative URLs if necessary
+                if image_url and image_url.startswith('/'):
+                    # Extract base URL from mirror
+                    base = re.match(r'(https?://[^/]+)', rss_url).group(1)
+                    image_url = f"{base}{image_url}"
+
+        entries.append({
+            "title": f"Social Update: {entry.title}",
+            "link": entry.link,
+            "description": summary_text,
+            "published": entry.get("published", datetime.now(timezone.utc).isoformat()),
+            "source_name": f"Social ({name})",
+            "source_id": source.get('id'),
+            "image_url": image_url
+        })
+    return entries
 
 def fetch_social_sentinels(sources):
     """Fetches updates from social sentinels (X/FB) via RSS-Bridge, RSSHub, or Nitter mirrors."""
     entries = []
     for source in sources:
-        raw_val = source['url_or_handle']
-        name = source['name']
-        
-        # Determine candidate RSS URLs
-        if raw_val.startswith('http'):
-            # Direct RSS link provided (e.g. RSS-Bridge or RSSHub)
-            rss_urls = [raw_val]
-        else:
-            # Handle provided, try Nitter mirrors for X
-            rss_urls = [f"{mirror}/{raw_val}/rss" for mirror in NITTER_MIRRORS]
-        
-        success = False
-        for rss_url in rss_urls:
-            print(f"Trying social feed: {rss_url}")
-            try:
-                # Use a small timeout to skip slow mirrors quickly
-                response = requests.get(rss_url, timeout=7, headers=DEFAULT_HEADERS)
-                if response.status_code == 200:
-                    feed = feedparser.parse(response.text)
-                    if feed.entries:
-                        print(f"Successfully fetched {len(feed.entries)} posts from {name} via {rss_url}")
-                        for entry in feed.entries:
-                            # Try to find image in entry (Nitter/RSS-Bridge often put it in the description as an <img> tag)
-                            image_url = None
-                            summary_text = entry.get("summary", entry.get("description", ""))
-                            if summary_text:
-                                soup = BeautifulSoup(summary_text, 'html.parser')
-                                img = soup.find('img')
-                                if img:
-                                    image_url = img.get('src')
-                                    # Handle relative URLs if necessary
-                                    if image_url and image_url.startswith('/'):
-                                        # Extract base URL from mirror
-                                        base = re.match(r'(https?://[^/]+)', rss_url).group(1)
-                                        image_url = f"{base}{image_url}"
-
-                            entries.append({
-                                "title": f"Social Update: {entry.title}",
-                                "link": entry.link,
-                                "description": summary_text,
-                                "published": entry.get("published", datetime.now(timezone.utc).isoformat()),
-                                "source_name": f"Social ({name})",
-                                "image_url": image_url
-                            })
-                        success = True
-                        break
-            except Exception as e:
-                print(f"Social Fetch Error ({rss_url}): {e}")
-                continue # Try next mirror
-        if not success:
-            print(f"Warning: Could not fetch {name} from any mirror/URL.")
+        entries.extend(fetch_social_source(source))
     return entries
 
 def scrape_efi_news():
@@ -407,8 +1936,9 @@ def scrape_efi_news():
     url = "https://efionline.org/category/news/"
     print(f"Scraping EFI News: {url}")
     try:
-        response = requests.get(url, timeout=15, headers=DEFAULT_HEADERS)
+        response = http_client.get(url, timeout=15)
         response.raise_for_status()
+        from bs4 import BeautifulSoup
         soup = BeautifulSoup(response.text, 'html.parser')
         
         entries = []
@@ -461,74 +1991,368 @@ def is_duplicate_url(supabase, url):
     result = supabase.rpc("check_url_exists", {"search_url": url}).execute()
     return result.data if result.data else False
 
-def fetch_and_ingest():
-    logger.log("job_started", "INFO")
-    try:
-        supabase = init_supabase()
-        
-        # Fetch Active Sources from DB
-        sources_result = supabase.table("crawler_sources").select("*").eq("is_active", True).execute()
-        db_sources = sources_result.data
-    
-        all_raw_entries = []
-        incidents_to_ingest = []
-    
-        # 1. Fetch RSS Feeds from DB
-        rss_sources = [s for s in db_sources if s['source_type'] == 'rss']
-        for feed_info in rss_sources:
-            print(f"Fetching RSS: {feed_info['name']}")
+def normalize_link(link):
+    """Canonical form of an entry link: lower-cased host, no fragment, tracking params or trailing slash."""
+    parts = urlsplit((link or "").strip())
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+             if not k.lower().startswith("utm_") and k.lower() not in TRACKING_PARAMS]
+    path = parts.path.rstrip('/') or '/'
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, urlencode(query), ''))
+
+class SeenEntryStore:
+    """Remembers every entry evaluated on earlier runs and what happened to it.
+
+    Keys combine the normalized link with a hash of the raw title and description,
+    so an article that is edited after we rejected it is evaluated again.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.keys = set()
+        self.pending = {}
+
+    @staticmethod
+    def entry_key(entry):
+        content_hash = hashlib.sha256(f"{entry['title']}\n{entry['description']}".encode('utf-8')).hexdigest()
+        return hashlib.sha256(f"{normalize_link(entry['link'])}\n{content_hash}".encode('utf-8')).hexdigest()
+
+    def load(self, supabase, days=SEEN_ENTRY_LOOKBACK_DAYS):
+        """Loads the keys of recently seen entries in a single round trip."""
+        since = (datetime.now(timezone.utc) - timedelta(days=days)).isoformat()
+        try:
+            result = supabase.rpc("get_seen_entry_keys", {"p_since": since}).execute()
+            self.keys = set(result.data or [])
+        except Exception as e:
+            print(f"Seen-entry store unavailable ({e}), every entry will be evaluated.")
+            self.keys = set()
+        return len(self.keys)
+
+    def is_seen(self, key):
+        return key in self.keys
+
+    def record(self, key, link, outcome, reason=None):
+        """Queues an outcome ('accepted', 'grouped' or 'rejected') for the end-of-run flush."""
+        with self._lock:
+            self.keys.add(key)
+            self.pending[key] = {
+                "entry_key": key,
+                "link": link,
+                "outcome": outcome,
+                "reason": reason,
+                "last_seen": datetime.now(timezone.utc).isoformat()
+            }
+
+    def flush(self, supabase, chunk_size=500):
+        """Upserts the outcomes recorded this run and prunes rows past the retention window."""
+        with self._lock:
+            rows, self.pending = list(self.pending.values()), {}
+        try:
+            for i in range(0, len(rows), chunk_size):
+                supabase.table("seen_entries").upsert(rows[i:i + chunk_size], on_conflict="entry_key").execute()
+            cutoff = (datetime.now(timezone.utc) - timedelta(days=SEEN_ENTRY_RETENTION_DAYS)).isoformat()
+            supabase.table("seen_entries").delete().lt("last_seen", cutoff).execute()
+        except Exception as e:
+            print(f"Error saving seen entries: {e}")
+
+def incident_row(incident):
+    """The DB row for a queued incident, without the ingest job's private '_' bookkeeping keys."""
+    return {k: v for k, v in incident.items() if not k.startswith('_')}
+
+class IncidentGrouper:
+    """Matches new reports to recent incidents through an inverted index over title tokens.
+
+    Only incidents sharing enough tokens with a title are fuzzy-scored, so a run
+    costs roughly O(entries x candidates) instead of O(entries x window).
+    Incidents queued earlier in the same run are indexed too.
+    """
+    def __init__(self, threshold=GROUPING_THRESHOLD, min_shared=GROUPING_MIN_SHARED_TOKENS):
+        self.threshold = threshold
+        self.min_shared = min_shared
+        self.records = []
+        self.index = {}
+
+    @staticmethod
+    def tokenize(title):
+        tokens = re.findall(r'[a-z0-9]+', title.lower())
+        return {t for t in tokens if len(t) > 2 and t not in GROUPING_STOPWORDS}
+
+    def load_recent(self, supabase, days=GROUPING_WINDOW_DAYS):
+        """Loads the grouping window once, paging past the PostgREST row limit."""
+        since = (datetime.now(timezone.utc) - timedelta(days=days)).isoformat()
+        start = 0
+        while True:
+            result = supabase.table("incidents").select("id, title, sources, image_url") \
+                .gt("incident_date", since).order("incident_date").order("id").range(start, start + GROUPING_PAGE_SIZE - 1).execute()
+            for row in result.data:
+                self.add(row)
+            if len(result.data) < GROUPING_PAGE_SIZE:
+                break
+            start += GROUPING_PAGE_SIZE
+        return len(self.records)
+
+    def add(self, record):
+        """Indexes an incident (a stored row with an id, or one queued for insert)."""
+        position = len(self.records)
+        self.records.append(record)
+        for token in self.tokenize(record['title']):
+            self.index.setdefault(token, []).append(position)
+
+    def find_match(self, title):
+        """Returns (record, similarity) for the best match above the threshold, or (None, 0)."""
+        from thefuzz.fuzz import token_set_ratio
+        tokens = self.tokenize(title)
+        required = min(self.min_shared, len(tokens))
+        if not required:
+            return None, 0
+
+        shared = {}
+        for token in tokens:
+            for position in self.index.get(token, ()):
+                shared[position] = shared.get(position, 0) + 1
+
+        best, best_score = None, 0
+        title_lower = title.lower()
+        for position, count in shared.items():
+            if count < required:
+                continue
+            record = self.records[position]
+            similarity = token_set_ratio(title_lower, record['title'].lower())
+            if similarity > self.threshold and similarity > best_score:
+                best, best_score = record, similarity
+        return best, best_score
+
+class IncidentWriter:
+    """Collects the run's incident writes and flushes them in a few round trips.
+
+    Sources grouped into stored incidents are merged per incident and sent to
+    the apply_incident_updates RPC, which appends them to the JSONB array in
+    the UPDATE itself, so concurrent writers cannot lose each other's sources.
+    New incidents go to the insert_incidents RPC in large chunks. It skips any
+    whose similarity_hash is already stored (so a retried insert is a no-op) and
+    returns that incident's id, and the skipped incident's sources are grouped
+    into it instead. Seen entries are recorded only for writes that land.
+    Feeds that contributed to a failed write, or to an entry whose page could not
+    be scraped, are collected in failed_sources.
+    """
+    def __init__(self):
+        self.inserts = []
+        self.updates = {}
+        self.failures = 0
+        self.failed_sources = set()
+
+    def _failed(self, entries):
+        self.failures += 1
+        self.failed_sources.update(source_id for _, _, _, source_id in entries if source_id)
+
+    def add_source(self, incident_id, source, image_url, entry):
+        """Queues a source (and a fallback image) for a stored incident; entry is its seen-entry record."""
+        self._merge(incident_id, [source], image_url, [entry])
+
+    def _merge(self, incident_id, sources, image_url, entries):
+        update = self.updates.setdefault(incident_id, {"id": incident_id, "sources": [], "image_url": None, "_entries": []})
+        for source in sources:
+            if all(s['url'] != source['url'] for s in update['sources']):
+                update['sources'].append(source)
+        update['image_url'] = update['image_url'] or image_url
+        update['_entries'].extend(entries)
+
+    def add_incident(self, incident):
+        self.inserts.append(incident)
+
+    def flush(self, supabase, seen_store):
+        """Writes everything queued; returns (incidents inserted, incidents updated)."""
+        inserted = updated = 0
+        for i in range(0, len(self.inserts), INSERT_CHUNK_SIZE):
+            chunk = self.inserts[i:i + INSERT_CHUNK_SIZE]
             try:
-                response = requests.get(feed_info['url_or_handle'], headers=DEFAULT_HEADERS, timeout=15)
-                response.raise_for_status()
-                feed = feedparser.parse(response.text)
+                result = supabase.rpc("insert_incidents", {"p_incidents": [incident_row(inc) for inc in chunk]}).execute()
             except Exception as e:
-                print(f"Error fetching RSS {feed_info['name']}: {e}")
+                self._failed([entry for inc in chunk for entry in inc['_entry_keys']])
+                print(f"Error inserting incidents: {e}")
                 continue
-            for entry in feed.entries:
-                # Try to find image URL in RSS extensions
-                image_url = None
-                # Common RSS image tags
-                if hasattr(entry, 'media_content'):
-                    image_url = entry.media_content[0].get('url')
-                elif hasattr(entry, 'links'):
-                    for l in entry.links:
-                        if l.get('rel') == 'enclosure' and 'image' in l.get('type', ''):
-                            image_url = l.get('href')
-            
-                # Try to find the fullest description possible
-                content = entry.get("summary", entry.get("description", ""))
-                if hasattr(entry, 'content') and entry.content:
-                    # content is usually a list of dicts with 'value' and 'type'
-                    full_content = entry.content[0].get('value', '')
-                    if len(full_content) > len(content):
-                        content = full_content
-            
-                all_raw_entries.append({
-                    "title": entry.title,
-                    "link": entry.link,
-                    "description": content,
-                    "published": entry.get("published", entry.get("updated", datetime.now().isoformat())),
-                    "source_name": feed_info['name'],
-                    "image_url": image_url
-                })
-            
-        # 2. Fetch NGO Scraped Data (EFI is currently special-cased logic)
-        efi_entries = scrape_efi_news()
-        all_raw_entries.extend(efi_entries)
-    
-        # 3. Fetch Social Sentinels from DB
-        social_sources = [s for s in db_sources if s['source_type'] == 'social']
-        social_entries = fetch_social_sentinels(social_sources)
-        all_raw_entries.extend(social_entries)
-    
-        # Efficiency Settings
-        DAYS_LOOKBACK = 3
-        threshold_date = datetime.now(timezone.utc) - timedelta(days=DAYS_LOOKBACK)
-        print(f"Daily Run: Focusing on incidents since {threshold_date.strftime('%Y-%m-%d')}")
+            stored = {row['similarity_hash']: row for row in result.data or []}
+            for inc in chunk:
+                row = stored.get(inc['similarity_hash'])
+                if row and row['inserted']:
+                    inserted += 1
+                    row['inserted'] = False # A repeat of this hash in the chunk groups into it
+                    for key, entry_link, outcome, _ in inc['_entry_keys']:
+                        seen_store.record(key, entry_link, outcome)
+                elif row:
+                    # Same content is already stored (outside the grouping window): add our sources to it
+                    entries = [(key, entry_link, "grouped", source_id) for key, entry_link, _, source_id in inc['_entry_keys']]
+                    self._merge(row['id'], inc['sources'], inc.get('image_url'), entries)
+                else:
+                    self._failed(inc['_entry_keys'])
+                    print(f"Incident not stored: {inc['title'][:50]}")
+
+        updates = list(self.updates.values())
+        for i in range(0, len(updates), UPDATE_CHUNK_SIZE):
+            chunk = updates[i:i + UPDATE_CHUNK_SIZE]
+            try:
+                supabase.rpc("apply_incident_updates", {"p_updates": [incident_row(u) for u in chunk]}).execute()
+                updated += len(chunk)
+                for update in chunk:
+                    for key, entry_link, outcome, _ in update['_entries']:
+                        seen_store.record(key, entry_link, outcome)
+            except Exception as e:
+                self._failed([entry for update in chunk for entry in update['_entries']])
+                print(f"Error applying grouped sources: {e}")
+
+        self.inserts, self.updates = [], {}
+        return inserted, updated
+
+def load_known_urls(supabase, days=KNOWN_URL_LOOKBACK_DAYS):
+    """Loads every source URL stored on recent incidents in a single round trip."""
+    since = (datetime.now(timezone.utc) - timedelta(days=days)).isoformat()
+    try:
+        result = supabase.rpc("get_known_source_urls", {"p_since": since}).execute()
+        return set(result.data or [])
+    except Exception as e:
+        # Fallback for databases without the RPC: one bulk select of the sources arrays
+        print(f"get_known_source_urls unavailable ({e}), falling back to bulk select.")
+        result = supabase.table("incidents").select("sources").gte("created_at", since).execute()
+        return {src.get('url') for row in result.data for src in (row.get('sources') or []) if src.get('url')}
+
+def ordered_map(func, items, pool, window=STAGE_WINDOW):
+    """Like pool.map, but pulls items lazily and keeps at most `window` calls in flight.
+
+    Results are yielded in input order as soon as the head of the line is done,
+    so a downstream stage starts while this one is still working.
+    """
+    pending = deque()
+    for item in items:
+        pending.append(pool.submit(func, item))
+        while pending and (len(pending) >= window or pending[0].done()):
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+class RunCheckpoint:
+    """Progress of the current ingest run, kept in CACHE_DIR so --resume can pick it up.
+
+    Fetched entries are appended to a JSONL file as they stream past; once the
+    fetch stage completes the feed validators are saved with it. Once grouping
+    completes, the new incidents, grouped-source updates and seen-entry outcomes
+    are saved, so a resumed run only summarizes (from the summary cache) and
+    writes. The checkpoint is removed after a run's writes all succeed.
+    """
+    def __init__(self, state_name=RUN_STATE_FILE, entries_name=RUN_ENTRIES_FILE):
+        self.state_name = state_name
+        self.entries_path = os.path.join(CACHE_DIR, entries_name)
+        self.state = {}
+
+    def load(self):
+        """Returns the saved state if a recent run left one, else None."""
+        state = load_cache_json(self.state_name, None)
+        if not state:
+            return None
+        age = datetime.now(timezone.utc) - datetime.fromisoformat(state['started_at'])
+        if age > timedelta(hours=RUN_STATE_MAX_AGE_HOURS):
+            print(f"Ignoring checkpoint from {state['started_at']} (older than {RUN_STATE_MAX_AGE_HOURS}h).")
+            return None
+        self.state = state
+        return state
 
-        for entry_data in all_raw_entries:
+    def start(self, threshold_date):
+        self.state = {
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "threshold_date": threshold_date.isoformat(),
+            "completed": []
+        }
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        open(self.entries_path, "w").close()
+        save_cache_json(self.state_name, self.state)
+
+    def completed(self, stage):
+        return stage in self.state.get("completed", [])
+
+    def record_entries(self, entries):
+        """Passes raw entries through, appending each to the entries file."""
+        with open(self.entries_path, "a", encoding="utf-8") as f:
+            for entry_data in entries:
+                f.write(json.dumps(entry_data, default=str) + "\n")
+                yield entry_data
+
+    def saved_entries(self):
+        with open(self.entries_path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+    def complete(self, stage, **data):
+        self.state["completed"].append(stage)
+        self.state.update(data)
+        save_cache_json(self.state_name, self.state)
+        print(f"Checkpoint: {stage} stage complete.")
+
+    def clear(self):
+        for path in (os.path.join(CACHE_DIR, self.state_name), self.entries_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+class IngestPipeline:
+    """One ingest run as a chain of streaming stages.
+
+    fetch -> normalize -> date_filter -> dedup -> deep_scrape -> classify ->
+    group -> summarize -> write. Every stage is a generator over the previous
+    stage's output; fetch, deep_scrape and summarize fan out to thread pools
+    with a bounded look-ahead, so network, CPU and LLM work overlap and only a
+    window of entries is in memory at once. A stage can be run on its own (any
+    iterable in) or swapped by overriding its method or `stages`.
+    """
+    stages = ["normalize", "date_filter", "dedup", "deep_scrape", "classify", "group", "summarize"]
+
+    def __init__(self, supabase, days_lookback=DAYS_LOOKBACK, checkpoint=None):
+        self.supabase = supabase
+        self.threshold_date = datetime.now(timezone.utc) - timedelta(days=days_lookback)
+        self.known_urls = set()
+        self.seen_store = SeenEntryStore()
+        self.grouper = IncidentGrouper()
+        self.writer = IncidentWriter()
+        self.checkpoint = checkpoint or RunCheckpoint()
+
+    def load_state(self):
+        """Loads the dedup and grouping state the stages check against, once per run."""
+        print(f"Daily Run: Focusing on incidents since {self.threshold_date.strftime('%Y-%m-%d')}")
+        # Every source URL we already hold, checked locally instead of one query per entry
+        self.known_urls = load_known_urls(self.supabase)
+        print(f"Loaded {len(self.known_urls)} known source URLs for dedup.")
+        # Entries evaluated on earlier runs (accepted or rejected) are skipped outright
+        print(f"Loaded {self.seen_store.load(self.supabase)} seen entry keys.")
+        # Recent incidents are loaded and indexed once for fuzzy grouping
+        print(f"Indexed {self.grouper.load_recent(self.supabase)} recent incidents for grouping.")
+
+    def fetch(self, db_sources):
+        """Fetches every active source in parallel, yielding raw entries.
+
+        Entries keep the sequential order (RSS, then EFI, then social) so grouping
+        behaves the same as a one-by-one run.
+        """
+        tasks = [(fetch_rss_feed, s) for s in db_sources if s['source_type'] == 'rss']
+        # NGO Scraped Data (EFI is currently special-cased logic)
+        tasks.append((scrape_efi_news,))
+        tasks += [(fetch_social_source, s) for s in db_sources if s['source_type'] == 'social']
+
+        def run_task(task):
+            func, *args = task
+            name = args[0]['name'] if args else "EFI"
+            started = time.perf_counter()
+            try:
+                entries = func(*args)
+            except Exception as e:
+                print(f"Fetch task failed: {e}")
+                entries = []
+            run_stats.source(name, time.perf_counter() - started, len(entries))
+            return entries
+
+        with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as pool:
+            for entries in ordered_map(run_task, tasks, pool, window=FETCH_WORKERS * 2):
+                yield from entries
+
+    def normalize(self, entries):
+        """Parses the publication date and cleans the title and description of each raw entry."""
+        for entry_data in entries:
             try:
-                # 1. Date Filter (Check this FIRST to avoid unnecessary scraping)
                 pub_date_str = entry_data.get("published", datetime.now(timezone.utc).isoformat())
                 try:
                     incident_date = date_parser.parse(pub_date_str)
@@ -537,128 +2361,337 @@ def fetch_and_ingest():
                         incident_date = incident_date.replace(tzinfo=timezone.utc)
                 except Exception:
                     incident_date = datetime.now(timezone.utc)
-            
-                # Use Sliding Window (3 days) OR 2026 Hard Floor
-                if incident_date < threshold_date or incident_date.year < 2026:
-                    # print(f"Skipping old/historical entry: {entry_data['title'][:50]}...")
-                    continue
+                yield {
+                    "entry": entry_data,
+                    "link": entry_data['link'],
+                    "incident_date": incident_date,
+                    "title": clean_title(entry_data['title']),
+                    # Sanitize description (remove HTML)
+                    "description": sanitize_text(entry_data['description'])
+                }
+            except Exception as e:
+                print(f"Error processing {entry_data.get('link', 'unknown')}: {e}")
 
-                # 2. Early URL Check (Avoid processing articles we already have)
-                link = entry_data['link']
-                existing_by_url = supabase.table("incidents").select("id").filter("sources", "cs", f'[{{"url": "{link}"}}]').execute()
-                if existing_by_url.data:
-                    # print(f"URL already in DB, skipping: {entry_data['title'][:50]}...")
-                    continue
+    def date_filter(self, items):
+        """Drops entries outside the sliding window (checked first to avoid unnecessary scraping)."""
+        for item in items:
+            # Use Sliding Window (3 days) OR 2026 Hard Floor
+            if item['incident_date'] < self.threshold_date or item['incident_date'].year < 2026:
+                continue
+            yield item
 
-                title = clean_title(entry_data['title'])
-                # Sanitize description (remove HTML)
-                description = sanitize_text(entry_data['description'])
-            
-                # DEEP SCRAPE: If description is too short, fetch the actual page
-                if len(description) < 500 and link and not "twitter.com" in link and not "xcancel.com" in link:
-                    full_text = deep_scrape_article(link)
-                    if len(full_text) > len(description):
-                        description = full_text
-            
-                # Extract specific location
-                location = extract_location(title, description)
-            
-                # Image URL from source
-                image_url = entry_data.get('image_url')
-                
-                # India?
-                full_text = f"{title} {description}".lower()
-                if not "india" in full_text:
+    def dedup(self, items):
+        """Skips entries a previous run evaluated and links we already hold (before any scraping)."""
+        for item in items:
+            item['entry_key'] = self.seen_store.entry_key(item['entry'])
+            if self.seen_store.is_seen(item['entry_key']):
+                run_stats.incr("skipped_seen")
+                continue
+            if item['link'] in self.known_urls:
+                run_stats.incr("skipped_known_url")
+                continue
+            # Claimed now, so a repeat of the link later in the stream is skipped too
+            self.known_urls.add(item['link'])
+            yield item
+
+    def _scrape(self, item):
+        link, description = item['link'], item['description']
+        # DEEP SCRAPE: If description is too short, fetch the actual page
+        if len(description) < 500 and link and not "twitter.com" in link and not "xcancel.com" in link:
+            try:
+                full_text = fetch_article(link)
+                if len(full_text) > len(description):
+                    item['description'] = full_text
+            except Exception as e:
+                print(f"Error scraping {link}: {e}")
+                # Judged on the feed snippet alone; a rejection is not remembered (see classify)
+                item['scrape_failed'] = True
+        return item
+
+    def deep_scrape(self, items):
+        """Fetches the article body for short descriptions, several pages at a time."""
+        with ThreadPoolExecutor(max_workers=SCRAPE_WORKERS) as pool:
+            for item in ordered_map(self._scrape, items, pool):
+                yield item
+
+    def reject(self, item, reason):
+        """Records a rejection, unless it rests on a failed scrape.
+
+        The entry is then left unrecorded and its feed keeps its old validators,
+        so the next run fetches the feed in full and tries the page again.
+        """
+        if item.get('scrape_failed'):
+            source_id = item['entry'].get('source_id')
+            if source_id:
+                self.writer.failed_sources.add(source_id)
+            run_stats.incr("rejected_unscraped")
+            return
+        self.seen_store.record(item['entry_key'], item['link'], "rejected", reason)
+        run_stats.incr(f"rejected_{reason}")
+
+    def classify(self, items):
+        """Keeps India persecution reports, recording why everything else was rejected."""
+        for item in items:
+            entry_data = item['entry']
+            # Classify once: relevance categories and location in a single scan
+            classification = keyword_classifier.classify(f"{item['title']} {item['description']}")
+            hits = classification["categories"]
+            # Extract specific location
+            item['location'] = keyword_classifier.best_location(classification)
+
+            # India?
+            if not hits.get("india"):
+                self.reject(item, "not_india")
+                continue
+
+            # Identity (Who?), Persecution (What happened?) and Negative (Is it just general news?) checks
+            has_identity = hits.get("identity", 0) > 0
+            has_persecution = hits.get("persecution", 0) > 0
+            has_negative = hits.get("negative", 0) > 0
+
+            if not (has_identity and has_persecution) or has_negative:
+                # Extra check: if it's from a known persecution-only source like EFI, be a bit more lenient
+                if not (entry_data['source_name'] == "Evangelical Fellowship of India" and (has_identity or has_persecution)):
+                    self.reject(item, "negative" if has_negative else "not_relevant")
                     continue
-            
-                # 2. Identity Check (Who?)
-                has_identity = any(kw in full_text for kw in IDENTITY_KEYWORDS)
-            
-                # 3. Persecution Check (What happened?)
-                has_persecution = any(kw in full_text for kw in PERSECUTION_KEYWORDS)
-            
-                # 4. Negative Check (Is it just general news?)
-                has_negative = any(kw in full_text for kw in NEGATIVE_KEYWORDS)
+            yield item
 
-                if not (has_identity and has_persecution) or has_negative:
-                    # Extra check: if it's from a known persecution-only source like EFI, be a bit more lenient
-                    if entry_data['source_name'] == "Evangelical Fellowship of India" and (has_identity or has_persecution):
-                        pass # Keep it
-                    else:
-                        continue
+    def group(self, items):
+        """Folds reports into similar incidents (stored or from this run), yielding only new incidents."""
+        for item in items:
+            entry_data, link, title = item['entry'], item['link'], item['title']
+            # Image URL from source
+            image_url = entry_data.get('image_url')
+            source = {"name": entry_data['source_name'], "url": link}
+            # Seen-entry record: (entry key, link, outcome, feed it came from)
+            seen = (item['entry_key'], link, "grouped", entry_data.get('source_id'))
+            existing, similarity = self.grouper.find_match(title)
+            if existing:
+                if existing.get('id'):
+                    # Stored incidents are updated in one batched, atomic write at the end of the run
+                    self.writer.add_source(existing['id'], source, image_url, seen)
+                else:
+                    # Incidents queued in this run are inserted later with their grouped sources
+                    existing['sources'].append(source)
+                    # Update image if existing doesn't have one
+                    if not existing.get('image_url') and image_url:
+                        existing['image_url'] = image_url
+                    existing['_entry_keys'].append(seen)
+                print(f"Grouped (Similarity {similarity}%): {title[:50]} with existing incident.")
+                run_stats.incr("grouped_stored" if existing.get('id') else "grouped_pending")
+                continue
 
-                # 3. Look for similar incidents in the last 72 hours
-                three_days_ago = (datetime.now() - timedelta(days=3)).isoformat()
-                recent_incidents = supabase.table("incidents").select("*").gt("incident_date", three_days_ago).execute()
-            
-                match_found = False
-                for existing in recent_incidents.data:
-                    similarity = fuzz.token_set_ratio(title.lower(), existing['title'].lower())
-                    if similarity > 75: # 75% similarity threshold
-                        # Found a broad match, add this source to the existing incident
-                        updated_sources = existing['sources']
-                        updated_sources.append({"name": entry_data['source_name'], "url": link})
-                    
-                        # Update image if existing doesn't have one
-                        update_data = {"sources": updated_sources}
-                        if not existing.get('image_url') and image_url:
-                            update_data['image_url'] = image_url
-                        
-                        supabase.table("incidents").update(update_data).eq("id", existing['id']).execute()
-                        print(f"Grouped (Similarity {similarity}%): {title[:50]} with existing incident.")
-                        match_found = True
-                        break
-            
-                if not match_found:
-                    # Add to batch for ingestion
-                    incidents_to_ingest.append({
-                        "title": title,
-                        "incident_date": incident_date.isoformat(),
-                        "description": description,
-                        "location_raw": location,
-                        "sources": [{"name": entry_data['source_name'], "url": link}],
-                        "is_verified": False,
-                        "image_url": image_url
-                    })
+            incident = {
+                "title": title,
+                "incident_date": item['incident_date'].isoformat(),
+                "description": item['description'],
+                "location_raw": item['location'],
+                "sources": [source],
+                "is_verified": False,
+                "image_url": image_url,
+                # Seen-entry outcomes are recorded only once the insert succeeds
+                "_entry_keys": [(item['entry_key'], link, "accepted", entry_data.get('source_id'))]
+            }
+            self.grouper.add(incident)
+            yield incident
 
-            except Exception as e:
-                print(f"Error processing {entry_data.get('link', 'unknown')}: {e}")
+    def _summarize_chunk(self, chunk):
+        try:
+            return chunk, summarize_with_cache(chunk, self.supabase)
+        except Exception as e:
+            print(f"Summarization failed: {e}")
+            return chunk, [(content_hash(inc), fallback_summary(inc)) for inc in chunk]
 
-        # Process Batch Ingestion
-        if incidents_to_ingest:
-            print(f"Processing batch of {len(incidents_to_ingest)} new incidents...")
-        
-            # Split into smaller batches for Gemini (max 5 at a time)
-            # Reduced batch size for better free tier reliability
-            batch_size = 3
-            for i in range(0, len(incidents_to_ingest), batch_size):
-                batch = incidents_to_ingest[i:i + batch_size]
-                print(f"Summarizing batch {i//batch_size + 1}...")
-                summaries = batch_summarize_incidents(batch)
-            
-                for index, inc in enumerate(batch):
-                    inc['summary'] = summaries[index]
-            
-                # Insert batch into Supabase
-                try:
-                    supabase.table("incidents").insert(batch).execute()
-                    print(f"Successfully ingested {len(batch)} incidents.")
-                except Exception as e:
-                    print(f"Error inserting batch: {e}")
-            
-                # Cooldown between batches
-                if i + batch_size < len(incidents_to_ingest):
-                    print(f"Cooling down for 10s before next batch...")
-                    time.sleep(10)
+    def summarize(self, incidents):
+        """Packs new incidents into token-budgeted chunks and summarizes them while upstream keeps going."""
+        budget = summary_batch_budget() - estimate_tokens(SUMMARY_INSTRUCTIONS)
+        workers = max(1, len(GEMINI_API_KEYS)) * GEMINI_WORKERS_PER_KEY
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            in_flight = deque()
+            chunk, used = [], 0
+
+            def submit():
+                in_flight.append(pool.submit(self._summarize_chunk, chunk))
+
+            for inc in incidents:
+                cost = estimate_tokens(incident_prompt(1, inc))
+                if chunk and (used + cost > budget or len(chunk) >= SUMMARY_MAX_ITEMS):
+                    submit()
+                    chunk, used = [], 0
+                chunk.append(inc)
+                used += cost
+                # Backpressure: block on the oldest chunk once enough are in flight
+                while in_flight and (len(in_flight) >= workers * 2 or in_flight[0].done()):
+                    yield from self._finished(in_flight.popleft())
+            if chunk:
+                submit()
+            while in_flight:
+                yield from self._finished(in_flight.popleft())
+
+    def _finished(self, future):
+        # Results are applied here, on the pipeline thread: group (and its checkpoint)
+        # may still be reading and updating these incidents while workers summarize
+        chunk, results = future.result()
+        # Saved after every chunk, before anything is inserted: a failed insert, or a
+        # job killed mid-stage and resumed, then does not pay for these summaries again
+        summary_cache.save()
+        for inc, (content, summary) in zip(chunk, results):
+            inc['similarity_hash'] = content
+            inc['summary'] = summary
+            yield inc
+
+    def write(self, incidents):
+        """Queues new incidents and flushes every write once the stream ends (later reports may still group into them)."""
+        for inc in incidents:
+            self.writer.add_incident(inc)
+        return self.writer.flush(self.supabase, self.seen_store)
+
+    def _then(self, stream, callback):
+        """Passes a stream through, calling back once it is exhausted (i.e. the stage completed)."""
+        yield from stream
+        callback()
+
+    def _fetch_done(self):
+        self.checkpoint.complete("fetch", feed_validators=feed_cache.pending)
+        # Redirects resolved so far are kept even if the run dies before the end
+        redirect_cache.save()
+
+    def _group_done(self):
+        self.checkpoint.complete(
+            "group",
+            incidents=[r for r in self.grouper.records if not r.get('id')],
+            updates=list(self.writer.updates.values()),
+            seen=list(self.seen_store.pending.values())
+        )
+
+    def run(self, db_sources, resume=False):
+        """Streams the sources through every stage; returns (incidents inserted, incidents updated).
+
+        With resume, a recent checkpoint skips the stages it completed: after
+        fetch the saved entries are replayed, after group only summarize and
+        write run.
+        """
+        state = self.checkpoint.load() if resume else None
+        if state and not state['completed']:
+            state = None # Died during fetch: nothing worth resuming
+        stages = list(self.stages)
+        if state:
+            print(f"Resuming run from {state['started_at']} after stages: {state['completed']}")
+            self.threshold_date = datetime.fromisoformat(state['threshold_date'])
+            feed_cache.pending.update(state.get('feed_validators', {}))
+        else:
+            self.checkpoint.start(self.threshold_date)
+
+        if state and self.checkpoint.completed("group"):
+            for row in state['seen']:
+                self.seen_store.record(row['entry_key'], row['link'], row['outcome'], row['reason'])
+            self.writer.updates = {u['id']: u for u in state['updates']}
+            stream = iter(state['incidents'])
+            stages = stages[stages.index("group") + 1:]
+        elif state and self.checkpoint.completed("fetch"):
+            stream = self.checkpoint.saved_entries()
+        else:
+            fetched = run_stats.instrument("fetch", lambda: self.fetch(db_sources))
+            stream = self._then(self.checkpoint.record_entries(fetched), self._fetch_done)
+
+        for stage in stages:
+            stream = run_stats.instrument(stage, getattr(self, stage), stream)
+            if stage == "group":
+                stream = self._then(stream, self._group_done)
+        inserted, updated = self.write(stream)
+        if not self.writer.failures:
+            self.checkpoint.clear()
+        return inserted, updated
+
+def fetch_and_ingest(resume=False):
+    logger.log("job_started", "INFO", {"resume": resume})
+    try:
+        supabase = init_supabase(count_round_trips=True)
         
-            logger.log("job_completed", "INFO", {"incidents_added": len(incidents_to_ingest)})
+        # Fetch Active Sources from DB
+        sources_result = supabase.table("crawler_sources").select("*").eq("is_active", True).execute()
+        db_sources = sources_result.data
+
+        pipeline = IngestPipeline(supabase)
+        pipeline.load_state()
+
+        inserted, updated = pipeline.run(db_sources, resume=resume)
+        print(f"Successfully ingested {inserted} incidents and added sources to {updated} existing ones.")
+        if inserted or updated:
+            logger.log("job_completed", "INFO", {
+                "incidents_added": inserted,
+                "incidents_updated": updated,
+                "http": http_client.stats()
+            })
+
+        # Only remember feed validators once their entries have been processed
+        feed_cache.flush(supabase, skip=pipeline.writer.failed_sources)
+        pipeline.seen_store.flush(supabase)
+        article_cache.evict()
+        redirect_cache.save()
+        if gemini_manager:
+            gemini_manager.health.save()
+        nitter_pool.save()
+        rss_bridge_pool.save()
+        print(f"HTTP stats: {http_client.stats()}")
+        print(f"Feed cache: {feed_cache.hits} unchanged, {feed_cache.misses} changed")
+        print(f"Article cache: {article_cache.stats()}")
+        print(f"Redirect cache: {redirect_cache.stats()}")
+        print(f"Summary cache: {summary_cache.stats()}")
+        print(f"Mirror success rates: {nitter_pool.stats()} {rss_bridge_pool.stats()}")
 
     except Exception as e:
         print(f"CRITICAL ERROR in ingestion: {e}")
         logger.log("job_failed_critical", "ERROR", {"error": str(e)})
+    finally:
+        summary = run_summary()
+        print(f"Run summary: {json.dumps(summary['stages'])}")
+        logger.log("run_summary", "INFO", summary)
 
-if __name__ == "__main__":
+def run_summary():
+    """Collects stage timings, counters, and cache/HTTP stats into one run_summary payload."""
+    summary = run_stats.summary()
+    summary.update({
+        "http": http_client.stats(),
+        "caches": {
+            "feed": {"unchanged": feed_cache.hits, "changed": feed_cache.misses},
+            "article": article_cache.stats(),
+            "redirect": redirect_cache.stats(),
+            "summary": summary_cache.stats(),
+        },
+        "mirrors": {"nitter": nitter_pool.stats(), "rss_bridge": rss_bridge_pool.stats()},
+    })
+    return summary
+
+def __getattr__(name):
+    # Scripts that import the shared Supabase client get it built on first access
+    if name == "supabase":
+        client = init_supabase() if SUPABASE_URL and SUPABASE_KEY else None
+        globals()["supabase"] = client
+        return client
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def main(argv=None):
+    """Command-line entry point: python scripts/ingest.py [--resume] [--profile [PATH]]."""
+    arg_parser = argparse.ArgumentParser(description="Fetch, classify, summarize and store new incidents.")
+    arg_parser.add_argument("--resume", action="store_true",
+                            help="continue the last interrupted run from its checkpoint instead of starting over")
+    arg_parser.add_argument("--profile", nargs="?", const="ingest.prof", metavar="PATH",
+                            help="run under cProfile and write the stats to PATH (default: ingest.prof)")
+    args = arg_parser.parse_args(argv)
     if not SUPABASE_URL or not SUPABASE_KEY:
         print("Error: SUPABASE_URL or SUPABASE_SERVICE_ROLE_KEY environment variables not set.")
+    elif args.profile:
+        import cProfile
+        import pstats
+        # Worker threads are not profiled; their time shows up as waits in the main thread
+        profiler = cProfile.Profile()
+        profiler.runcall(fetch_and_ingest, resume=args.resume)
+        profiler.dump_stats(args.profile)
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(25)
+        print(f"Profile written to {args.profile}")
     else:
-        fetch_and_ingest()
+        fetch_and_ingest(resume=args.resume)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+import os
+import sys
+import glob
+import json
+import timeit
+import resource
+import subprocess
+import tracemalloc
+# Add project root to sys.path to import scripts
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from bs4 import BeautifulSoup
+from scripts.ingest import extract_article_text, decode_html, HAS_LXML, ARTICLE_MAX_BYTES
+
+FIXTURES = sorted(glob.glob(os.path.join(os.path.dirname(__file__), "fixtures", "articles", "*.html")))
+
+def legacy_extract(html):
+    """The pre-streaming deep_scrape_article parse: full html.parser tree, then trim to 5000 chars."""
+    soup = BeautifulSoup(html, "html.parser")
+    for script in soup(["script", "style", "nav", "footer", "header", "aside"]):
+        script.decompose()
+    content_selectors = [
+        'div.entry-content', 'div.article-body', 'div.story-content',
+        'article', 'main', 'div.post-content'
+    ]
+    main_content = ""
+    for selector in content_selectors:
+        target = soup.select_one(selector)
+        if target:
+            main_content = target.get_text(separator=' ', strip=True)
+            break
+    if not main_content:
+        paragraphs = soup.find_all('p')
+        main_content = ' '.join([p.get_text(strip=True) for p in paragraphs if len(p.get_text()) > 20])
+    return main_content[:5000]
+
+def current_extract(raw):
+    return extract_article_text(decode_html(raw[:ARTICLE_MAX_BYTES]))
+
+def load_fixtures():
+    pages = {}
+    for path in FIXTURES:
+        with open(path, "rb") as f:
+            pages[os.path.basename(path)] = f.read()
+    return pages
+
+def peak_rss_kb(impl):
+    """Peak RSS of a fresh interpreter extracting every fixture (tracemalloc cannot see libxml2).
+
+    Both workers import the same modules, so the difference is down to the parser.
+    """
+    output = subprocess.check_output([sys.executable, __file__, "--worker", impl])
+    return json.loads(output.decode().strip().splitlines()[-1])["peak_rss_kb"]
+
+def run_worker(impl):
+    for raw in load_fixtures().values():
+        for _ in range(20):
+            legacy_extract(raw.decode("utf-8")) if impl == "legacy" else current_extract(raw)
+    print(json.dumps({"peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss}))
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3 and sys.argv[1] == "--worker":
+        run_worker(sys.argv[2])
+        sys.exit(0)
+
+    print(f"Parser: {'lxml' if HAS_LXML else 'html.parser (lxml not installed)'}")
+    for name, raw in load_fixtures().items():
+        html = raw.decode("utf-8")
+        legacy_time = min(timeit.repeat(lambda: legacy_extract(html), number=5, repeat=3)) / 5
+        current_time = min(timeit.repeat(lambda: current_extract(raw), number=5, repeat=3)) / 5
+
+        tracemalloc.start()
+        legacy_extract(html)
+        legacy_peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.reset_peak()
+        current_extract(raw)
+        current_peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        same = legacy_extract(html) == current_extract(raw)
+        print(f"{name} ({len(raw) // 1024} KB): "
+              f"legacy {legacy_time * 1000:.2f} ms / {legacy_peak // 1024} KB py-heap, "
+              f"current {current_time * 1000:.2f} ms / {current_peak // 1024} KB py-heap "
+              f"({legacy_time / current_time:.1f}x, output {'identical' if same else 'DIFFERS'})")
+
+    print(f"Peak RSS over all fixtures: legacy {peak_rss_kb('legacy')} KB, current {peak_rss_kb('current')} KB")
@@ -0,0 +1,366 @@
+"""Offline end-to-end benchmark for fetch_and_ingest.
+
+Recorded feeds, article pages and the EFI listing (test/fixtures/bench) are
+served by a local HTTP stand-in that every outbound request is routed to.
+Supabase and Gemini are replaced by in-process fakes with configurable latency
+and 429 rate. Each scenario runs the real pipeline end to end and reports
+throughput, per-stage latency and peak memory; --check compares them with the
+saved baseline so regressions show up.
+
+    python test/bench_ingest.py                   # report, compared with the baseline
+    python test/bench_ingest.py --check           # exit 1 on a regression
+    python test/bench_ingest.py --save-baseline   # record the current numbers
+"""
+import os
+import re
+import sys
+import json
+import time
+import zlib
+import base64
+import random
+import shutil
+import argparse
+import tempfile
+import resource
+import threading
+import contextlib
+import tracemalloc
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit
+
+# Caches must point somewhere disposable before the module is imported
+os.environ["INGEST_CACHE_DIR"] = tempfile.mkdtemp(prefix="bench-ingest-")
+for name in ("SUPABASE_URL", "SUPABASE_SECRET_KEY", "GEMINI_API_KEY"):
+    os.environ[name] = ""
+# Add project root to sys.path to import scripts
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from requests.adapters import HTTPAdapter
+import scripts.ingest as ingest
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures", "bench")
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "bench_ingest_baseline.json")
+REGRESSION_TOLERANCE = 0.25 # Relative slack before a metric counts as a regression
+HOURS_AGO = re.compile(r"\{\{hours_ago:(\d+)\}\}")
+
+def load_fixture(path):
+    with open(os.path.join(FIXTURES, path), encoding="utf-8") as f:
+        return f.read()
+
+class StandIn:
+    """Local HTTP server answering for every host the ingest job talks to.
+
+    Requests arrive as /<original host><original path>; feeds and the EFI page
+    come from routes.json (with publication dates made relative to now), Google
+    News article links redirect to the URL encoded in them, blocked hosts 403,
+    dead hosts 503, r.jina.ai returns plain text and anything else is an article.
+    """
+    def __init__(self, latency):
+        self.latency = latency
+        self.routes = json.loads(load_fixture("routes.json"))
+        self.articles = [load_fixture(f"articles/{name}") for name in sorted(os.listdir(os.path.join(FIXTURES, "articles")))]
+        self.jina_text = ingest.extract_article_text(self.articles[0])
+        self.requests = 0
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stand_in.handle(self, body=True)
+
+            def do_HEAD(self):
+                stand_in.handle(self, body=False)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.port = self.server.server_port
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def respond(self, handler, status, content_type="text/html; charset=utf-8", text="", headers=None, body=True):
+        data = text.encode("utf-8")
+        handler.send_response(status)
+        handler.send_header("Content-Type", content_type)
+        handler.send_header("Content-Length", str(len(data)))
+        for key, value in (headers or {}).items():
+            handler.send_header(key, value)
+        handler.end_headers()
+        if body:
+            handler.wfile.write(data)
+
+    def handle(self, handler, body):
+        self.requests += 1
+        time.sleep(self.latency)
+        host, _, path = handler.path.lstrip("/").partition("/")
+        path = "/" + path
+        url = f"https://{host}{path}"
+        feeds = self.routes["feeds"]
+        if host in self.routes["dead_hosts"]:
+            return self.respond(handler, 503, body=body)
+        route = feeds.get(url) or (feeds.get(path) if path.endswith("/rss") else None)
+        if route:
+            now = datetime.now(timezone.utc)
+            text = HOURS_AGO.sub(lambda m: format_datetime(now - timedelta(hours=int(m.group(1)))), load_fixture(route))
+            kind = "application/rss+xml" if route.endswith(".xml") else "text/html; charset=utf-8"
+            return self.respond(handler, 200, kind, text, body=body)
+        if host == "news.google.com" and path.startswith("/rss/articles/"):
+            token = path.split("/")[3].split("?")[0]
+            target = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)).decode()
+            return self.respond(handler, 302, headers={"Location": target}, body=body)
+        if host == "r.jina.ai":
+            return self.respond(handler, 200, "text/plain; charset=utf-8", self.jina_text, body=body)
+        if host in self.routes["blocked_hosts"]:
+            return self.respond(handler, 403, body=body)
+        article = self.articles[zlib.crc32(path.encode()) % len(self.articles)]
+        return self.respond(handler, 200, text=article, body=body)
+
+    def close(self):
+        self.server.shutdown()
+
+class StandInAdapter(HTTPAdapter):
+    """Sends every request to the stand-in, keeping the original host in the path."""
+    def __init__(self, port, **kwargs):
+        self.port = port
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        parts = urlsplit(request.url)
+        query = f"?{parts.query}" if parts.query else ""
+        request.url = f"http://127.0.0.1:{self.port}/{parts.netloc}{parts.path or '/'}{query}"
+        return super().send(request, **kwargs)
+
+class FakeResult:
+    def __init__(self, data):
+        self.data = data
+
+class FakeQuery:
+    """Accepts any PostgREST builder chain; execute() costs one round trip."""
+    def __init__(self, db, table, op=None):
+        self.db = db
+        self.table = table
+        self.op = op
+
+    def __getattr__(self, name):
+        def chain(*args, **kwargs):
+            if name in ("select", "insert", "upsert", "update", "delete"):
+                self.op = name
+                if name in ("insert", "upsert"):
+                    self.rows = args[0]
+            return self
+        return chain
+
+    def execute(self):
+        return self.db.round_trip(self)
+
+class FakeSupabase:
+    """In-memory stand-in for the Supabase client with a fixed per-request latency."""
+    def __init__(self, latency, sources):
+        self.latency = latency
+        self.sources = sources
+        self.round_trips = {}
+        self.inserted = []
+        self._lock = threading.Lock()
+
+    def table(self, name):
+        return FakeQuery(self, name)
+
+    def rpc(self, name, params=None):
+        query = FakeQuery(self, name, "rpc")
+        query.rows = (params or {}).get("p_incidents", [])
+        return query
+
+    def round_trip(self, query):
+        time.sleep(self.latency)
+        with self._lock:
+            key = f"{query.table}.{query.op}"
+            self.round_trips[key] = self.round_trips.get(key, 0) + 1
+            if query.table == "insert_incidents":
+                self.inserted.extend(query.rows)
+        if query.table == "crawler_sources" and query.op == "select":
+            return FakeResult([dict(s) for s in self.sources])
+        if query.table == "insert_incidents":
+            return FakeResult([{"similarity_hash": row["similarity_hash"], "id": f"incident-{n}", "inserted": True}
+                               for n, row in enumerate(query.rows)])
+        return FakeResult([])
+
+class FakeGemini:
+    """Gemini client double: answers the structured summary prompt after `latency`, 429ing at `rate_429`."""
+    def __init__(self, latency, rate_429, seed):
+        self.latency = latency
+        self.rate_429 = rate_429
+        self.rng = random.Random(seed)
+        self.calls = 0
+        self.rate_limited = 0
+        self._lock = threading.Lock()
+        self.models = self
+
+    def generate_content(self, model, contents, config=None):
+        with self._lock:
+            self.calls += 1
+            limited = self.rng.random() < self.rate_429
+            self.rate_limited += limited
+        time.sleep(self.latency)
+        if limited:
+            raise Exception("429 RESOURCE_EXHAUSTED. {'retryDelay': '1s'}")
+        ids = re.findall(r"--- INCIDENT (\d+) ---\nTITLE: (.*)", contents)
+        summaries = [{"id": i, "summary": f"* **{title}**\n* Reported and under follow-up."} for i, title in ids]
+        return type("Response", (), {"text": json.dumps(summaries)})()
+
+class TimedPipeline(ingest.IngestPipeline):
+    """IngestPipeline that records when each stage emits its first and last item."""
+    started = None
+    timings = {}
+
+    def _timed(self, stage, stream):
+        first = last = None
+        count = 0
+        for item in stream:
+            now = time.perf_counter() - self.started
+            first = now if first is None else first
+            last = now
+            count += 1
+            yield item
+        TimedPipeline.timings[stage] = {"items": count, "first_s": round(first or 0, 3), "last_s": round(last or 0, 3)}
+
+    def fetch(self, db_sources):
+        TimedPipeline.started = time.perf_counter()
+        return self._timed("fetch", super().fetch(db_sources))
+
+for _stage in ingest.IngestPipeline.stages:
+    def _wrapped(self, stream, _stage=_stage):
+        return self._timed(_stage, getattr(super(TimedPipeline, self), _stage)(stream))
+    setattr(TimedPipeline, _stage, _wrapped)
+
+def install(args, cache_dir, stand_in):
+    """Points the module's singletons at fresh caches and the fake backends."""
+    sources = json.loads(load_fixture("sources.json"))
+    db = FakeSupabase(args.db_latency, sources)
+    gemini = FakeGemini(args.gemini_latency, args.gemini_429_rate, seed=7)
+    keys = [f"bench-key-{i}" for i in range(args.gemini_keys)]
+
+    ingest.CACHE_DIR = cache_dir
+    ingest.article_cache = ingest.ArticleCache(os.path.join(cache_dir, "articles.sqlite3"))
+    ingest.redirect_cache = ingest.RedirectCache()
+    ingest.summary_cache = ingest.SummaryCache()
+    ingest.feed_cache = ingest.FeedCache()
+    ingest.nitter_pool = ingest.MirrorPool("nitter", ingest.NITTER_MIRRORS)
+    ingest.rss_bridge_pool = ingest.MirrorPool("rss_bridge", ingest.RSS_BRIDGE_INSTANCES)
+    ingest.http_client = ingest.HttpClient()
+    retry = ingest.http_client.session.get_adapter("https://").max_retries
+    adapter = StandInAdapter(stand_in.port, pool_connections=4, pool_maxsize=64, max_retries=retry)
+    ingest.http_client.session.mount("https://", adapter)
+    ingest.http_client.session.mount("http://", adapter)
+    ingest.GEMINI_API_KEYS = keys
+    ingest.gemini_manager = ingest.GeminiManager(keys)
+    ingest.gemini_manager.clients = {key: gemini for key in keys}
+    ingest.logger = ingest.LogManager(db)
+    ingest.run_stats = ingest.RunStats()
+    ingest.init_supabase = lambda count_round_trips=False: db
+    ingest.IngestPipeline = TimedPipeline
+    return db, gemini
+
+def run_scenario(name, args, cache_dir, stand_in, trace_memory=False):
+    db, gemini = install(args, cache_dir, stand_in)
+    TimedPipeline.timings = {}
+    if trace_memory:
+        tracemalloc.start()
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(sys.stdout if args.verbose else open(os.devnull, "w")):
+        ingest.fetch_and_ingest()
+        ingest.logger.flush()
+    wall = time.perf_counter() - started
+    peak_heap = tracemalloc.get_traced_memory()[1] if trace_memory else None
+    if trace_memory:
+        tracemalloc.stop()
+
+    fetched = TimedPipeline.timings.get("fetch", {}).get("items", 0)
+    return {
+        "scenario": name,
+        "wall_s": round(wall, 3),
+        "entries": fetched,
+        "entries_per_s": round(fetched / wall, 1) if wall else 0.0,
+        "incidents_written": len(db.inserted),
+        "stages": dict(TimedPipeline.timings),
+        "http_requests": stand_in.requests,
+        "gemini_calls": gemini.calls,
+        "gemini_429s": gemini.rate_limited,
+        "db_round_trips": sum(db.round_trips.values()),
+        "peak_heap_kb": peak_heap // 1024 if peak_heap is not None else None
+    }
+
+def run_all(args):
+    stand_in = StandIn(args.http_latency)
+    results = {}
+    try:
+        cache_dir = tempfile.mkdtemp(prefix="bench-cold-")
+        stand_in.requests = 0
+        results["cold"] = run_scenario("cold", args, cache_dir, stand_in)
+        # Same caches again: a retried or resumed run
+        stand_in.requests = 0
+        results["warm"] = run_scenario("warm", args, cache_dir, stand_in)
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+        # Separate traced run: tracemalloc slows everything down, so it is not timed
+        cache_dir = tempfile.mkdtemp(prefix="bench-memory-")
+        stand_in.requests = 0
+        results["cold"]["peak_heap_kb"] = run_scenario("memory", args, cache_dir, stand_in, trace_memory=True)["peak_heap_kb"]
+        shutil.rmtree(cache_dir, ignore_errors=True)
+    finally:
+        stand_in.close()
+    results["peak_rss_kb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return results
+
+def report(results):
+    for name in ("cold", "warm"):
+        r = results[name]
+        print(f"\n[{name}] {r['entries']} entries in {r['wall_s']}s ({r['entries_per_s']} entries/s), "
+              f"{r['incidents_written']} incidents written")
+        print(f"  http requests {r['http_requests']}, gemini calls {r['gemini_calls']} ({r['gemini_429s']} x 429), "
+              f"db round trips {r['db_round_trips']}" + (f", peak heap {r['peak_heap_kb']} KB" if r['peak_heap_kb'] else ""))
+        for stage, t in r["stages"].items():
+            print(f"  {stage:12} {t['items']:5} items  first {t['first_s']:7.3f}s  last {t['last_s']:7.3f}s")
+    print(f"\nPeak RSS: {results['peak_rss_kb']} KB")
+
+def regressions(results, baseline):
+    """Metrics worse than the baseline by more than REGRESSION_TOLERANCE."""
+    found = []
+    checks = [("cold", "wall_s", True), ("warm", "wall_s", True), ("cold", "peak_heap_kb", True),
+              ("cold", "entries_per_s", False), ("cold", "gemini_calls", True), ("cold", "db_round_trips", True)]
+    for scenario, metric, lower_is_better in checks:
+        old, new = baseline.get(scenario, {}).get(metric), results[scenario].get(metric)
+        if not old or new is None:
+            continue
+        change = (new - old) / old if lower_is_better else (old - new) / old
+        if change > REGRESSION_TOLERANCE:
+            found.append(f"{scenario}.{metric}: {old} -> {new}")
+    return found
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--http-latency", type=float, default=0.02, help="seconds per stand-in response")
+    parser.add_argument("--db-latency", type=float, default=0.03, help="seconds per Supabase round trip")
+    parser.add_argument("--gemini-latency", type=float, default=0.4, help="seconds per Gemini call")
+    parser.add_argument("--gemini-429-rate", type=float, default=0.1, help="share of Gemini calls answered with a 429")
+    parser.add_argument("--gemini-keys", type=int, default=2)
+    parser.add_argument("--save-baseline", action="store_true", help=f"write the results to {os.path.basename(BASELINE_PATH)}")
+    parser.add_argument("--check", action="store_true", help="exit 1 if any metric regressed past the baseline")
+    parser.add_argument("--verbose", action="store_true", help="show the ingest job's own output")
+    args = parser.parse_args()
+
+    results = run_all(args)
+    report(results)
+
+    if args.save_baseline:
+        with open(BASELINE_PATH, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"Baseline saved to {BASELINE_PATH}")
+    elif os.path.exists(BASELINE_PATH):
+        with open(BASELINE_PATH, encoding="utf-8") as f:
+            found = regressions(results, json.load(f))
+        print("\nRegressions vs baseline: " + (", ".join(found) if found else "none"))
+        if found and args.check:
+            sys.exit(1)
@@ -0,0 +1,79 @@
+import os
+import sys
+import random
+import timeit
+# Add project root to sys.path to import scripts
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from scripts.ingest import (
+    keyword_classifier, INDIAN_LOCATIONS, IDENTITY_KEYWORDS,
+    PERSECUTION_KEYWORDS, NEGATIVE_KEYWORDS
+)
+
+FILLER = (
+    "the local community gathered on sunday while officials said an update would follow "
+    "after the company released its statement about the upcoming campaign and its impact"
+).split()
+
+def legacy_classify(title, description):
+    """The pre-classifier logic: three any() scans plus the nested location scan."""
+    full_text = f"{title} {description}".lower()
+    location = "India"
+    for state, keywords in INDIAN_LOCATIONS.items():
+        if any(kw in full_text for kw in keywords):
+            location = state
+            break
+    return (
+        "india" in full_text,
+        any(kw in full_text for kw in IDENTITY_KEYWORDS),
+        any(kw in full_text for kw in PERSECUTION_KEYWORDS),
+        any(kw in full_text for kw in NEGATIVE_KEYWORDS),
+        location
+    )
+
+def compiled_classify(title, description):
+    result = keyword_classifier.classify(f"{title} {description}")
+    hits = result["categories"]
+    return (
+        hits.get("india", 0) > 0,
+        hits.get("identity", 0) > 0,
+        hits.get("persecution", 0) > 0,
+        hits.get("negative", 0) > 0,
+        keyword_classifier.best_location(result)
+    )
+
+def build_corpus(size=300, words=400, seed=7):
+    """Feed-sized synthetic reports: mostly filler with a few real keywords mixed in."""
+    rng = random.Random(seed)
+    vocabulary = IDENTITY_KEYWORDS + PERSECUTION_KEYWORDS + NEGATIVE_KEYWORDS
+    cities = [kw for keywords in INDIAN_LOCATIONS.values() for kw in keywords if len(kw) > 2]
+    corpus = []
+    for _ in range(size):
+        body = [rng.choice(FILLER) for _ in range(words)]
+        for _ in range(rng.randint(0, 4)):
+            body[rng.randrange(words)] = rng.choice(vocabulary)
+        if rng.random() < 0.6:
+            body[rng.randrange(words)] = rng.choice(cities)
+        if rng.random() < 0.7:
+            body[rng.randrange(words)] = "india"
+        corpus.append((f"Report {len(corpus)}", ' '.join(body)))
+    return corpus
+
+def bench(func, corpus, repeat=5):
+    timer = timeit.Timer(lambda: [func(t, d) for t, d in corpus])
+    return min(timer.repeat(repeat=repeat, number=1)) / len(corpus)
+
+if __name__ == "__main__":
+    corpus = build_corpus()
+    legacy = bench(legacy_classify, corpus)
+    compiled = bench(compiled_classify, corpus)
+    print(f"Entries: {len(corpus)} (~{len(corpus[0][1])} chars each)")
+    print(f"Legacy any() scans : {legacy * 1e6:8.1f} us/entry")
+    print(f"Compiled classifier: {compiled * 1e6:8.1f} us/entry ({legacy / compiled:.1f}x)")
+
+    # Substring matching finds "up"/"mp" inside ordinary words; the classifier does not
+    changed = [(t, legacy_classify(t, d)[4], compiled_classify(t, d)[4])
+               for t, d in corpus if legacy_classify(t, d)[4] != compiled_classify(t, d)[4]]
+    print(f"Location differences: {len(changed)} of {len(corpus)}")
+    for title, old, new in changed[:5]:
+        print(f"  {title}: {old} -> {new}")
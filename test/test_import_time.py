@@ -0,0 +1,35 @@
+import os
+import sys
+import json
+import subprocess
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+IMPORT_BUDGET_SECONDS = 0.5 # Was ~0.9s when every client library was imported eagerly
+DEFERRED_MODULES = ["feedparser", "bs4", "thefuzz", "lxml", "supabase", "google.genai"]
+
+PROBE = """
+import sys, time, json
+started = time.perf_counter()
+import scripts.ingest
+elapsed = time.perf_counter() - started
+print(json.dumps({"seconds": elapsed, "loaded": [m for m in %r if m in sys.modules]}))
+""" % (DEFERRED_MODULES,)
+
+def measure_import():
+    """Imports scripts.ingest in a fresh interpreter without credentials, best of three."""
+    env = {k: v for k, v in os.environ.items() if k not in ("SUPABASE_URL", "SUPABASE_SECRET_KEY", "GEMINI_API_KEY")}
+    runs = []
+    for _ in range(3):
+        output = subprocess.check_output([sys.executable, "-c", PROBE], cwd=PROJECT_ROOT, env=env)
+        runs.append(json.loads(output.decode().strip().splitlines()[-1]))
+    return min(runs, key=lambda run: run["seconds"])
+
+def test_import_defers_heavy_modules():
+    result = measure_import()
+    print(f"\nImport took {result['seconds'] * 1000:.0f} ms")
+    assert result["loaded"] == []
+    assert result["seconds"] < IMPORT_BUDGET_SECONDS
+
+if __name__ == "__main__":
+    test_import_defers_heavy_modules()
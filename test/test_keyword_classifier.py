@@ -0,0 +1,38 @@
+import os
+import sys
+# Add project root to sys.path to import scripts
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from scripts.ingest import keyword_classifier
+
+def categories(text):
+    return keyword_classifier.classify(text)["categories"]
+
+def location(text):
+    return keyword_classifier.best_location(keyword_classifier.classify(text))
+
+def test_keywords_do_not_match_inside_other_words():
+    print("\n--- Testing whole-word category matching ---")
+    hits = categories("Mobile phones, a new lawn and a courtesy call at the India church")
+    print(hits)
+    assert "persecution" not in hits
+    assert hits == {"india": 1, "identity": 1}
+
+def test_regular_inflections_still_match():
+    hits = categories("Indian pastors attacked; police arrested the attackers and churches were vandalised")
+    print(hits)
+    assert hits["india"] == 1
+    assert hits["identity"] == 2
+    assert hits["persecution"] == 5
+
+def test_abbreviations_need_upper_case():
+    print("\n--- Testing location abbreviations ---")
+    assert location("Believers were beaten in UP last week") == "Uttar Pradesh"
+    assert location("Police came up to the church with an update") == "India"
+    assert location("Christians in MP were threatened") == "Madhya Pradesh"
+    assert location("Pastor's mp3 sermon and a lamp were seized") == "India"
+
+if __name__ == "__main__":
+    test_keywords_do_not_match_inside_other_words()
+    test_regular_inflections_still_match()
+    test_abbreviations_need_upper_case()
@@ -0,0 +1,51 @@
+import os
+import re
+import sys
+import json
+import timeit
+# Add project root to sys.path to import scripts
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from bs4 import BeautifulSoup
+from scripts.ingest import sanitize_text
+
+CORPUS_PATH = os.path.join(os.path.dirname(__file__), "fixtures", "sanitize_corpus.json")
+
+def legacy_sanitize_text(text):
+    """The original implementation: a full BeautifulSoup tree for every input."""
+    if not text: return ""
+    clean = BeautifulSoup(text, "html.parser").get_text()
+    clean = re.sub(r'\s+', ' ', clean).strip()
+    return clean
+
+def load_corpus():
+    with open(CORPUS_PATH, encoding="utf-8") as f:
+        return json.load(f)
+
+def test_matches_recorded_corpus():
+    print("\n--- Testing sanitize_text against the recorded corpus ---")
+    corpus = load_corpus()
+    mismatches = [c for c in corpus if sanitize_text(c["input"]) != c["expected"]]
+    for case in mismatches:
+        print(f"Input: {case['input']!r}\nExpected: {case['expected']!r}\nGot: {sanitize_text(case['input'])!r}")
+    assert not mismatches
+    print(f"All {len(corpus)} recorded cases match.")
+
+def feed_sized_inputs():
+    """Representative descriptions: plain summaries, Google News snippets and WordPress excerpts."""
+    plain = "Police detained a pastor and five believers after a prayer meeting in the village. " * 6
+    google_news = ('<a href="https://news.google.com/rss/articles/CBMi?oc=5" target="_blank">Christians attacked '
+                   'in Odisha village</a>&nbsp;&nbsp;<font color="#6f6f6f">The Hindu</font>')
+    wordpress = ('<p><img src="https://x/i.jpg" alt="Church" />' + plain + '</p><p>The post <a href="https://x/">'
+                 'Christians in India beaten</a> appeared first on <a href="https://x">Morning Star News</a>.</p>')
+    return {"plain": plain, "google_news": google_news, "wordpress": wordpress}
+
+if __name__ == "__main__":
+    test_matches_recorded_corpus()
+
+    print("\n--- Benchmarking sanitize_text ---")
+    for name, text in feed_sized_inputs().items():
+        legacy = min(timeit.repeat(lambda: legacy_sanitize_text(text), number=200, repeat=3)) / 200
+        current = min(timeit.repeat(lambda: sanitize_text(text), number=200, repeat=3)) / 200
+        print(f"{name:12} ({len(text)} chars): legacy {legacy * 1e6:7.1f} us, current {current * 1e6:7.1f} us "
+              f"({legacy / current:.1f}x)")